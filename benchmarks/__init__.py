@@ -0,0 +1,3 @@
+# 성능 벤치마크 (합성 데이터 생성 + Flask 테스트 클라이언트로 라우트 측정)
+#   python -m benchmarks.run --products 10000 --output bench_results.json
+#   python -m benchmarks.compare bench_before.json bench_after.json
@@ -0,0 +1,66 @@
+import argparse
+import json
+import sys
+
+
+# ========== 두 벤치마크 결과 비교 ==========
+# 시나리오별 지연시간/처리량/할당량의 변화율을 보여준다 (음수 = 빨라짐/줄어듦)
+METRICS = ['p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'ttfb_p50_ms', 'cpu_ms_mean', 'alloc_peak_kib_mean',
+           'response_bytes_mean']
+
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='벤치마크 결과 JSON 두 개를 비교한다')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--metric', action='append', choices=METRICS,
+                        help='비교할 항목 (기본: p50/p95/p99/처리량)')
+    parser.add_argument('--threshold', type=float, default=10.0, help='이 비율(%%) 이상 변하면 표시')
+    args = parser.parse_args(argv)
+
+    with open(args.before, encoding='utf-8') as f:
+        before = json.load(f)
+    with open(args.after, encoding='utf-8') as f:
+        after = json.load(f)
+    metrics = args.metric or METRICS[:4]
+
+    for label, report in (('before', before), ('after', after)):
+        meta = report['meta']
+        print(f"{label:6s} {str(meta.get('git_commit'))[:10]}{'+' if meta.get('git_dirty') else ''} "
+              f"상품 {meta.get('products')}개, 장바구니 {meta.get('carts')}, 프로필 {meta.get('profile')}")
+    if before['meta'].get('products') != after['meta'].get('products'):
+        print('⚠️ 상품 수가 다른 결과끼리 비교하고 있습니다')
+    print()
+
+    header = f"{'scenario':24s}" + ''.join(f'{m:>28s}' for m in metrics)
+    print(header)
+    print('-' * len(header))
+    for name in sorted(set(before['scenarios']) | set(after['scenarios'])):
+        b = before['scenarios'].get(name)
+        a = after['scenarios'].get(name)
+        if b is None or a is None:
+            print(f"{name:24s} {'(before 없음)' if b is None else '(after 없음)'}")
+            continue
+        cells = []
+        for metric in metrics:
+            # 이전 버전의 결과 파일에는 없는 항목일 수 있다
+            pct = change(b.get(metric), a.get(metric))
+            mark = ''
+            if pct is not None and abs(pct) >= args.threshold:
+                # 처리량은 클수록 좋고 나머지는 작을수록 좋다
+                better = pct > 0 if metric == 'throughput_rps' else pct < 0
+                mark = ' ✅' if better else ' ❌'
+            pct_text = 'n/a' if pct is None else f'{pct:+.1f}%'
+            cells.append(f'{str(b.get(metric, "-")):>9} → {str(a.get(metric, "-")):<9} {pct_text:>7}{mark}'.rjust(28))
+        print(f'{name:24s}' + ''.join(cells))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import json
+import random
+from datetime import datetime, timedelta
+
+from sprout import db
+from sprout.hashing import password_hasher
+from sprout.models import CartItem, User
+from sprout.sync import refresh_cart_snapshots, sync_products
+
+
+# ========== 합성 데이터 생성 ==========
+# 실제 카탈로그(data/products.json)와 비슷한 분포의 스타일/브랜드/이름을 시드 기반으로 만든다
+
+STYLES = ['모던', '미드센추리', '내추럴', '우드', '빈티지', '북유럽']
+BRANDS = ['드리아데', '엘엔씨스텐달', '콜드 포그', '몰', '헬러', '뮬러', '브리온베가', '알리아스',
+          '올루체', '누키', '보더바', '오도코펜하겐', '카르텔', '비트라', '프리츠한센', '헤이']
+NOUNS = ['CHAIR', 'TABLE', 'SOFA', 'LAMP', 'SHELF', 'DESK', 'BED', 'STOOL',
+         '체어', '테이블', '소파', '조명', '선반', '책상', '침대', '스툴']
+ADJECTIVES = ['ROTATE', 'EASY', 'NET', 'STACKING', 'FIRST', 'TOWER', 'CLASSIC', 'LOUNGE',
+              '루스', '코', '게르다', '아르노', '오크', '매트']
+COLORS = ['블루 체크', '블랙 스트라이프', '네이비', '오크', '크롬', '화이트', '그레이', '월넛']
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_EMAIL_DOMAIN = 'bench.local'
+# 장바구니 추가/삭제 시나리오 전용 사용자 (빈 장바구니로 시작해서 측정이 끝나면 다시 비게 된다)
+BENCH_CART_WRITER = 'bench-cart-writer'
+
+
+def make_product(rng, product_id):
+    noun = rng.choice(NOUNS)
+    return {
+        'id': product_id,
+        'brand': rng.choice(BRANDS),
+        'name': f'{rng.choice(ADJECTIVES)} {noun} _ {rng.choice(COLORS)}',
+        'price': rng.randrange(10, 3000) * 500,
+        'description': f'{noun} 벤치마크용 상품 {product_id}',
+        'image_url': f'https://example.com/products/{product_id}.png',
+        'style': rng.choice(STYLES),
+    }
+
+
+def write_products_json(path, count, seed=0):
+    # 1M 개도 메모리에 다 올리지 않도록 한 줄씩 써 내려간다
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"products": [\n')
+        for product_id in range(1, count + 1):
+            if product_id > 1:
+                f.write(',\n')
+            f.write(json.dumps(make_product(rng, product_id), ensure_ascii=False))
+        f.write('\n]}\n')
+    return path
+
+
+def bench_username(index):
+    return f'bench{index:05d}'
+
+
+def create_users(cart_sizes, product_count, seed=0):
+    """cart_sizes 의 각 값마다 사용자를 한 명씩 만들고 그만큼 장바구니를 채운다.
+    장바구니가 빈 BENCH_CART_WRITER 사용자도 함께 만든다 (반환값에는 포함하지 않음).
+
+    반환값: [(username, 장바구니 개수), ...]
+    """
+    rng = random.Random(seed)
+    # 해시는 한 번만 계산해서 모든 사용자에게 재사용한다 (생성 시간 대부분이 해시 비용이므로)
+    password = password_hasher.hash(BENCH_PASSWORD)
+    now = datetime.now()
+
+    users = []
+    for username in [bench_username(index) for index in range(len(cart_sizes))] + [BENCH_CART_WRITER]:
+        users.append({
+            'username': username,
+            'password': password,
+            'email': f'{username}@{BENCH_EMAIL_DOMAIN}',
+            'phone': '010-0000-0000',
+            'cart_version': 0,
+            'created_date': now,
+        })
+    db.session.execute(db.insert(User), users)
+
+    ids = dict(db.session.execute(
+        db.select(User.username, User.id).where(User.username.in_([u['username'] for u in users]))
+    ).all())
+
+    result = []
+    for index, cart_size in enumerate(cart_sizes):
+        username = bench_username(index)
+        cart_size = min(cart_size, product_count)
+        product_ids = rng.sample(range(1, product_count + 1), cart_size)
+        # 스냅샷 컬럼은 비워 두고 sync 의 refresh_cart_snapshots 로 채운다
+        rows = [{
+            'user_id': ids[username],
+            'username': username,
+            'product_id': product_id,
+            'created_date': now - timedelta(seconds=i),
+        } for i, product_id in enumerate(product_ids)]
+        if rows:
+            db.session.execute(db.insert(CartItem), rows)
+        result.append((username, cart_size))
+
+    db.session.commit()
+    return result
+
+
+def populate(app, products_path, product_count, cart_sizes, seed=0, log=print):
+    """products.json 생성 → Product 동기화 → 사용자/장바구니 생성"""
+    write_products_json(products_path, product_count, seed)
+    with app.app_context():
+        db.create_all()
+        sync_products(products_path, log=log)
+        users = create_users(cart_sizes, product_count, seed)
+        # 장바구니 스냅샷 채우기 (실제 운영 데이터처럼 스냅샷이 있는 상태로 측정)
+        refresh_cart_snapshots()
+    return users
@@ -0,0 +1,255 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from benchmarks.generate import BENCH_CART_WRITER, BENCH_PASSWORD, populate
+
+
+# ========== 측정 유틸 ==========
+def percentile(sorted_values, pct):
+    # nearest-rank 방식
+    if not sorted_values:
+        return 0.0
+    index = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def measure(name, make_request, requests, warmup, alloc_requests):
+    for i in range(warmup):
+        make_request(i)
+
+    # 1) 지연시간: tracemalloc 을 끈 상태에서 측정
+    timings = []
+    ttfb = []
+    statuses = {}
+    response_bytes = 0
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    for i in range(requests):
+        t0 = time.perf_counter_ns()
+        response = make_request(warmup + i)
+        # 스트리밍 응답은 본문을 읽을 때 렌더링되므로, 응답 객체가 나온 시점을 첫 바이트 시간으로 본다
+        t1 = time.perf_counter_ns()
+        # 테스트 클라이언트는 압축을 풀지 않으므로 실제 전송되는 바이트 수다
+        response_bytes += len(response.get_data())
+        timings.append((time.perf_counter_ns() - t0) / 1e6)
+        ttfb.append((t1 - t0) / 1e6)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    elapsed = time.perf_counter() - started
+    cpu_seconds = time.process_time() - cpu_started
+
+    # 2) 할당량: tracemalloc 은 느리므로 별도 패스에서 적은 횟수로 요청당 최대 사용량만 잰다
+    peaks = []
+    tracemalloc.start()
+    for i in range(alloc_requests):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        make_request(warmup + requests + i)
+        peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+    tracemalloc.stop()
+
+    timings.sort()
+    ttfb.sort()
+    return {
+        'requests': requests,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3) if timings else 0.0,
+        'max_ms': round(timings[-1], 3) if timings else 0.0,
+        'ttfb_p50_ms': round(percentile(ttfb, 50), 3),
+        'ttfb_p95_ms': round(percentile(ttfb, 95), 3),
+        'throughput_rps': round(requests / elapsed, 1) if elapsed else 0.0,
+        'cpu_ms_mean': round(cpu_seconds * 1000 / requests, 3) if requests else 0.0,
+        'status_codes': {str(k): v for k, v in sorted(statuses.items())},
+        'response_bytes_mean': round(response_bytes / requests) if requests else 0,
+        'alloc_peak_kib_mean': round(sum(peaks) / len(peaks), 1) if peaks else 0.0,
+        'alloc_peak_kib_max': round(max(peaks), 1) if peaks else 0.0,
+    }
+
+
+# ========== 시나리오 ==========
+# 각 시나리오는 반복 번호 i 를 받아 요청 하나를 보내는 함수다.
+# 같은 URL 만 반복하면 캐시만 재게 되므로 몇 가지 변형을 번갈아 보낸다.
+def build_scenarios(app, users, product_count, accept_encoding=''):
+    def new_client():
+        client = app.test_client()
+        if accept_encoding:
+            client.environ_base['HTTP_ACCEPT_ENCODING'] = accept_encoding
+        return client
+
+    def logged_in_client(username):
+        client = new_client()
+        client.post('/login/', data={'username': username, 'password': BENCH_PASSWORD})
+        return client
+
+    anon = new_client()
+    heaviest = max(users, key=lambda u: u[1])[0]
+    cart_client = logged_in_client(heaviest)
+    writer_client = logged_in_client(BENCH_CART_WRITER)
+
+    def cycle(client, urls):
+        return lambda i: client.get(urls[i % len(urls)])
+
+    scenarios = {
+        'sub_default': cycle(anon, [f'/sub?page={p}' for p in range(1, 6)]),
+        'sub_search': cycle(anon, ['/sub?search=chair', '/sub?search=테이블', '/sub?search=lamp&page=2',
+                                   '/sub?search=오크', '/sub?search=no-such-product']),
+        'sub_facets': cycle(anon, ['/sub?style=모던', '/sub?style=모던&style=우드',
+                                   '/sub?brand=헤이', '/sub?style=내추럴&brand=몰&brand=뮬러']),
+        'sub_sort': cycle(anon, ['/sub?sort=price_low', '/sub?sort=price_high',
+                                 '/sub?sort=price_low&page=3', '/sub?sort=price_high&page=7']),
+        'sub_combined': cycle(anon, ['/sub?search=chair&style=모던&sort=price_low',
+                                     '/sub?search=체어&brand=비트라&sort=price_high&page=2',
+                                     '/sub?style=북유럽&brand=카르텔&brand=헤이&sort=price_low']),
+        'sub_price': cycle(anon, ['/sub?min_price=100000&max_price=300000',
+                                  '/sub?max_price=50000&sort=price_low',
+                                  '/sub?min_price=1000000&sort=price_high&page=2',
+                                  '/sub?style=모던&min_price=200000&max_price=800000']),
+        # SUB_STREAM_MIN_PER_PAGE 이상이면 스트리밍으로 렌더링된다
+        'sub_large_page': cycle(anon, ['/sub?per_page=200', '/sub?per_page=200&page=2&sort=price_low']),
+        'product_detail': lambda i: anon.get(f'/product_detail?product_id={i % product_count + 1}'),
+    }
+
+    # 추가/삭제는 빈 장바구니로 시작하는 전용 사용자로 같은 상품 범위를 쓰므로, 끝나면 장바구니가 다시 빈다
+    # (시드 사용자의 장바구니를 건드리지 않아 이후 cart_check / mypage 시나리오의 장바구니 크기가 그대로다)
+    def cart_target(i):
+        return (i * 7919) % product_count + 1
+
+    scenarios['cart_add'] = lambda i: writer_client.post('/cart/add', json={'product_id': cart_target(i)})
+    scenarios['cart_remove'] = lambda i: writer_client.post('/cart/remove', json={'product_id': cart_target(i)})
+    scenarios['cart_check'] = lambda i: cart_client.get('/cart/check')
+
+    for username, cart_size in users:
+        client = logged_in_client(username)
+        pages = max((cart_size + 2) // 3, 1)
+        scenarios[f'mypage[cart={cart_size}]'] = (
+            lambda i, client=client, pages=pages: client.get(f'/mypage?page={i % pages + 1}')
+        )
+
+    login_client = new_client()
+    scenarios['login'] = lambda i: login_client.post(
+        '/login/', data={'username': heaviest, 'password': BENCH_PASSWORD})
+    return scenarios
+
+
+# ========== 실행 환경 정보 ==========
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT,
+                                         text=True, stderr=subprocess.DEVNULL).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=REPO_ROOT,
+                                             text=True, stderr=subprocess.DEVNULL).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='sprout 라우트 성능 벤치마크')
+    parser.add_argument('--products', type=int, default=10000, help='합성 상품 수 (1000 ~ 1000000)')
+    parser.add_argument('--carts', default='0,10,100,1000',
+                        help='사용자별 장바구니 개수 (쉼표로 구분, 사용자 한 명당 하나)')
+    parser.add_argument('--requests', type=int, default=200, help='시나리오별 측정 요청 수')
+    parser.add_argument('--warmup', type=int, default=10, help='시나리오별 워밍업 요청 수')
+    parser.add_argument('--alloc-requests', type=int, default=20, help='시나리오별 할당량 측정 요청 수')
+    parser.add_argument('--only', default='', help='실행할 시나리오 이름 접두어 (쉼표로 구분)')
+    parser.add_argument('--profile', default=None, help='설정 프로필 (development / production)')
+    parser.add_argument('--no-fragment-cache', action='store_true', help='/sub 그리드 캐시를 끄고 측정')
+    parser.add_argument('--profiling', action='store_true',
+                        help='PROFILING_ENABLED 로 실행하고 /__metrics 집계를 결과에 포함')
+    parser.add_argument('--accept-encoding', default='gzip, deflate, br',
+                        help="요청의 Accept-Encoding 헤더 ('' 이면 압축 없이 측정)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workdir', default=None, help='DB/JSON 을 만들 디렉터리 (기본: 임시 디렉터리)')
+    parser.add_argument('--output', default='bench_results.json')
+    args = parser.parse_args(argv)
+
+    from sprout import create_app
+
+    cart_sizes = [int(v) for v in args.carts.split(',') if v.strip()]
+    workdir = args.workdir or tempfile.mkdtemp(prefix='sprout-bench-')
+    os.makedirs(workdir, exist_ok=True)
+    db_path = os.path.join(workdir, 'bench.db')
+    products_path = os.path.join(workdir, 'products.json')
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    overrides = {
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{db_path}',
+        'PRODUCTS_JSON_PATH': products_path,
+        'WTF_CSRF_ENABLED': False,
+        'LOG_LEVEL': 'WARNING',
+    }
+    if args.no_fragment_cache:
+        overrides['SUB_FRAGMENT_CACHE_SIZE'] = 0
+    if args.profiling:
+        overrides['PROFILING_ENABLED'] = True
+    app = create_app(args.profile, overrides)
+
+    print(f'데이터 생성: 상품 {args.products}개, 장바구니 {cart_sizes} ({workdir})')
+    t0 = time.perf_counter()
+    users = populate(app, products_path, args.products, cart_sizes, args.seed, log=lambda msg: None)
+    setup_seconds = time.perf_counter() - t0
+    print(f'데이터 생성 완료: {setup_seconds:.1f}초')
+
+    scenarios = build_scenarios(app, users, args.products, args.accept_encoding)
+    only = [v.strip() for v in args.only.split(',') if v.strip()]
+
+    results = {}
+    for name, make_request in scenarios.items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        result = measure(name, make_request, args.requests, args.warmup, args.alloc_requests)
+        results[name] = result
+        print(f"{name:24s} p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+              f"p99 {result['p99_ms']:8.2f}ms  {result['throughput_rps']:8.1f} req/s  "
+              f"{result['alloc_peak_kib_mean']:8.1f} KiB  {result['status_codes']}")
+
+    commit, dirty = git_commit()
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'git_commit': commit,
+            'git_dirty': dirty,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sqlite': sqlite3.sqlite_version,
+            'profile': app.config['PROFILE'],
+            'fragment_cache': not args.no_fragment_cache,
+            'profiling': args.profiling,
+            'accept_encoding': args.accept_encoding,
+            'products': args.products,
+            'carts': cart_sizes,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'setup_seconds': round(setup_seconds, 2),
+        },
+        'scenarios': results,
+    }
+    if 'compression' in app.extensions:
+        # 응답 압축에 쓴 CPU 시간과 압축률 (워밍업/할당량 측정 요청 포함)
+        report['compression'] = app.extensions['compression'].stats()
+    if args.profiling:
+        # 워밍업/할당량 측정 요청까지 포함된 엔드포인트별 쿼리 수/DB/템플릿 시간
+        report['profiling'] = app.test_client().get('/__metrics').get_json()
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f'결과 저장: {args.output}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,3 +4,118 @@ BASE_DIR = os.path.dirname(__file__)
 
 SQLALCHEMY_DATABASE_URI = f'sqlite:///{os.path.join(BASE_DIR, 'sprout.db')}'
 SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+# 상품 카탈로그 (data/products.json)
+PRODUCTS_JSON_PATH = os.path.join(BASE_DIR, 'data', 'products.json')
+CATALOG_CHECK_INTERVAL = 1.0  # 파일 변경(mtime/size) 확인 주기 (초)
+# products.json 을 컴파일한 컬럼형 카탈로그 (flask compile-catalog / update_db.py 가 만든다).
+# 지금의 products.json 으로 만들어진 파일이 있으면 mmap 으로 열어 쓰고, 없거나 오래되었으면 JSON 을 읽는다.
+CATALOG_COLUMNAR_PATH = os.path.join(BASE_DIR, 'data', 'products.catalog')
+
+# Jinja 템플릿 바이트코드 캐시 디렉터리 (None 이면 사용하지 않음, flask compile-templates 로 미리 채운다)
+TEMPLATE_BYTECODE_CACHE_DIR = os.path.join(BASE_DIR, '.jinja_cache')
+
+# /sub 목록 조회 방식: 'catalog' (프로세스 상주 카탈로그) 또는 'db' (Product 테이블에 SQL 로 조회)
+PRODUCT_LISTING_SOURCE = 'catalog'
+
+# /sub 제품 그리드 렌더링 결과 캐시 (항목 수, 유효 시간 초)
+SUB_FRAGMENT_CACHE_SIZE = 512
+SUB_FRAGMENT_CACHE_TTL = 300
+
+# /sub 페이지당 상품 수 (?per_page= 로 바꿀 수 있고 최대값으로 제한)
+SUB_PER_PAGE = 25
+SUB_MAX_PER_PAGE = 200
+# 페이지당 상품 수가 이 이상이면 sub.html 을 스트리밍으로 렌더링한다 (None 이면 사용 안 함)
+SUB_STREAM_MIN_PER_PAGE = 100
+SUB_STREAM_CHUNK_SIZE = 8192  # 스트리밍 시 한 번에 내보낼 최소 크기 (bytes)
+
+# 로그인 사용자 스냅샷 캐시 (항목 수, 유효 시간 초)
+IDENTITY_CACHE_SIZE = 1024
+IDENTITY_CACHE_TTL = 60
+
+# 로그 레벨 (sprout 전체 기본값 + 모듈별 설정). 예: {'sprout.views.product_views': 'DEBUG'}
+LOG_LEVEL = 'INFO'
+LOG_LEVELS = {}
+LOG_QUEUE_SIZE = 10000
+
+# /cart/batch 한 번에 처리할 수 있는 최대 요청 수
+CART_BATCH_MAX_OPS = 200
+
+# /cart/check?ids= 로 한 번에 확인할 수 있는 최대 상품 수
+CART_CHECK_MAX_IDS = 200
+
+# 사용자별 장바구니 상품 id 캐시 (항목 수, 유효 시간 초). cart_version 이 바뀌면 유효 시간과 관계없이 다시 읽는다
+CART_MEMBERSHIP_CACHE_SIZE = 4096
+CART_MEMBERSHIP_CACHE_TTL = 3600
+
+# 비밀번호 해시 설정 (werkzeug 방식 문자열). 바꾸면 기존 사용자는 다음 로그인 때 새 방식으로 다시 저장된다
+PASSWORD_HASH_METHOD = 'scrypt:32768:8:1'
+PASSWORD_HASH_MAX_CONCURRENCY = None  # 동시에 실행할 해시 작업 수 (None 이면 CPU 코어 수)
+PASSWORD_HASH_TIMEOUT = 5.0           # 해시 슬롯 대기 시간 (초), 넘으면 503
+
+# 요청별 프로파일링 (Server-Timing 헤더 + /__metrics). 꺼져 있으면 훅 자체를 등록하지 않는다
+PROFILING_ENABLED = False
+PROFILING_SLOW_QUERIES = 20      # /__metrics 에 보관할 가장 느린 쿼리 수
+PROFILING_SLOW_QUERY_MS = None   # 이 시간(ms) 이상 걸린 쿼리는 경고 로그 (None 이면 기록 안 함)
+
+# 반응형 이미지 파생본 (flask build-images). 경로는 static 폴더 기준
+IMAGE_SOURCE_DIR = 'image'
+IMAGE_DERIVED_DIR = 'image/derived'
+IMAGE_WIDTHS = (320, 640, 960, 1280, 1920)
+IMAGE_FORMATS = ('webp', 'jpeg')   # 앞의 형식부터 <source> 로 제공하고 jpeg 는 <img> 대체용
+IMAGE_QUALITY = {'webp': 80, 'jpeg': 82}
+IMAGE_BUILD_WORKERS = None         # 변환 프로세스 수 (None 이면 CPU 코어 수)
+
+# 정적 자산 번들 (flask build-assets). 번들 이름 → static 폴더 기준 원본 파일 (순서대로 이어 붙임)
+ASSET_BUNDLES = {
+    'base.css': ['main.css'],
+    'base.js': ['js.js'],
+    'sub.css': ['sub.css'],
+    'sub.js': ['sub.js'],
+    'mypage.css': ['mypage.css'],
+    'mypage.js': ['mypage.js'],
+    'auth.css': ['auth.css'],
+}
+ASSET_DIST_DIR = 'dist'
+ASSET_MAX_AGE = 31536000  # 지문이 붙은 파일의 캐시 시간 (1년, immutable)
+
+# HTML/JSON 응답 압축 (Accept-Encoding 에 따라 br 또는 gzip). br 은 brotli 패키지가 있을 때만
+COMPRESSION_ENABLED = True
+COMPRESSION_MIN_SIZE = 1024       # 이보다 작은 응답은 압축하지 않음 (bytes)
+COMPRESSION_LEVEL = 6             # gzip 레벨 (1~9)
+COMPRESSION_BROTLI_QUALITY = 4    # brotli 품질 (0~11)
+COMPRESSION_MIMETYPES = ('text/html', 'application/json')
+
+# ========== 환경별 프로필 ==========
+# create_app(config_name) 또는 SPROUT_ENV 환경변수로 선택하며, 위의 기본값을 덮어쓴다.
+#   SQLITE_PRAGMAS: SQLite 연결이 만들어질 때마다 적용할 PRAGMA
+#   SQLALCHEMY_ENGINE_OPTIONS: 엔진/커넥션 풀 설정
+DEFAULT_PROFILE = 'development'
+
+PROFILES = {
+    'development': {
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+        },
+        'SQLALCHEMY_ENGINE_OPTIONS': {},
+    },
+    'production': {
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'WAL',        # 쓰기 중에도 읽기(/mypage 등)가 막히지 않음
+            'synchronous': 'NORMAL',      # WAL 에서는 NORMAL 로도 손상 없이 안전
+            'mmap_size': 268435456,       # 256MB
+            'cache_size': -65536,         # 음수는 KB 단위 (64MB)
+            'busy_timeout': 5000,         # 잠금 대기 (ms)
+            'temp_store': 'MEMORY',
+        },
+        'SQLALCHEMY_ENGINE_OPTIONS': {
+            'pool_size': 10,
+            'max_overflow': 10,
+            'pool_timeout': 10,
+            'pool_recycle': 3600,
+            'pool_pre_ping': True,
+        },
+    },
+}
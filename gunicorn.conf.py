@@ -0,0 +1,70 @@
+import os
+import time
+
+# ========== gunicorn 설정 (운영) ==========
+#   gunicorn -c gunicorn.conf.py sprout.wsgi:app
+# 값은 환경변수로 덮어쓸 수 있다: PORT, WEB_CONCURRENCY, GUNICORN_THREADS, GUNICORN_MAX_REQUESTS
+
+def _cpu_count():
+    # 컨테이너에 할당된 코어 수 (cpuset 기준)
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# 동기 워커 + 스레드: 요청 처리 중 SQLite/해시 대기가 있어도 다른 요청을 받을 수 있게
+workers = int(os.environ.get('WEB_CONCURRENCY', _cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 2))
+
+# 마스터에서 앱과 카탈로그를 미리 올리고 fork (워커끼리 메모리 공유, 워커 시작이 빠름)
+preload_app = True
+
+# 메모리 증가/누수에 대비해 일정 요청 수마다 워커를 교체한다 (동시에 몰리지 않도록 jitter)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = max_requests // 10
+graceful_timeout = 30
+timeout = 30
+keepalive = 5
+
+accesslog = None
+errorlog = '-'
+loglevel = 'info'
+
+_started = time.monotonic()
+
+
+def _memory_kb():
+    # RSS 와 PSS (공유 페이지를 프로세스 수로 나눈 값) 를 KB 로
+    values = {}
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty'):
+                    values[key] = int(rest.split()[0])
+    except OSError:
+        pass
+    return values
+
+
+def when_ready(server):
+    from sprout import wsgi
+    memory = _memory_kb()
+    server.log.info('시작 완료: %.2f초 (앱 로드 %.2f초), 워커 %d개 x 스레드 %d, 마스터 RSS %s KB',
+                    time.monotonic() - _started, wsgi.load_seconds, server.cfg.workers, server.cfg.threads,
+                    memory.get('Rss', '?'))
+
+
+def post_worker_init(worker):
+    memory = _memory_kb()
+    shared = memory.get('Shared_Clean', 0) + memory.get('Shared_Dirty', 0)
+    worker.log.info('워커 %s 시작: RSS %s KB, PSS %s KB, 공유 %s KB',
+                    worker.pid, memory.get('Rss', '?'), memory.get('Pss', '?'), shared)
+
+
+def worker_exit(server, worker):
+    server.log.info('워커 %s 종료 (처리한 요청 %s건)', worker.pid, getattr(worker, 'nr', '?'))
@@ -0,0 +1,41 @@
+"""product listing indexes
+
+Revision ID: 7c1e4b2a9d10
+Revises: 449cddd9029d
+Create Date: 2026-10-18 10:12:31.204118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e4b2a9d10'
+down_revision = '449cddd9029d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # product 테이블은 update_db.py 의 create_all() 로 만들어졌을 수 있으므로 없을 때만 생성
+    if not sa.inspect(op.get_bind()).has_table('product'):
+        op.create_table('product',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('brand', sa.String(length=100), nullable=True),
+        sa.Column('name', sa.String(length=150), nullable=False),
+        sa.Column('price', sa.Integer(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('image_url', sa.String(length=255), nullable=True),
+        sa.Column('style', sa.String(length=50), nullable=True),
+        sa.Column('created_date', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.create_index('ix_product_style_price', ['style', 'price'], unique=False)
+        batch_op.create_index('ix_product_brand_price', ['brand', 'price'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_brand_price')
+        batch_op.drop_index('ix_product_style_price')
@@ -0,0 +1,26 @@
+"""product price index
+
+Revision ID: a93d4c7e1b05
+Revises: f2c95d7e4a61
+Create Date: 2026-10-18 16:40:52.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a93d4c7e1b05'
+down_revision = 'f2c95d7e4a61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.create_index('ix_product_price', ['price'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        batch_op.drop_index('ix_product_price')
@@ -0,0 +1,29 @@
+"""user cart_version
+
+Revision ID: b3f09e5d2c47
+Revises: 7c1e4b2a9d10
+Create Date: 2026-10-18 11:03:52.918264
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f09e5d2c47'
+down_revision = '7c1e4b2a9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # update_db.py 로 이미 추가된 경우는 건너뛴다
+    columns = [col['name'] for col in sa.inspect(op.get_bind()).get_columns('user')]
+    if 'cart_version' not in columns:
+        with op.batch_alter_table('user', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('cart_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('cart_version')
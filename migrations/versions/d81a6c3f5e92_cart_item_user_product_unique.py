@@ -0,0 +1,31 @@
+"""cart_item (user_id, product_id) unique
+
+Revision ID: d81a6c3f5e92
+Revises: b3f09e5d2c47
+Create Date: 2026-10-18 13:40:07.551873
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd81a6c3f5e92'
+down_revision = 'b3f09e5d2c47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # 기존 중복 행은 가장 먼저 담긴 것(id 최소)만 남긴다
+    op.execute(
+        'DELETE FROM cart_item WHERE id NOT IN '
+        '(SELECT MIN(id) FROM cart_item GROUP BY user_id, product_id)'
+    )
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.create_index('ux_cart_item_user_product', ['user_id', 'product_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.drop_index('ux_cart_item_user_product')
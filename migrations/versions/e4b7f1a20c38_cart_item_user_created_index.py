@@ -0,0 +1,26 @@
+"""cart_item (user_id, created_date) index
+
+Revision ID: e4b7f1a20c38
+Revises: d81a6c3f5e92
+Create Date: 2026-10-18 14:26:45.108392
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7f1a20c38'
+down_revision = 'd81a6c3f5e92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.create_index('ix_cart_item_user_created', ['user_id', 'created_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.drop_index('ix_cart_item_user_created')
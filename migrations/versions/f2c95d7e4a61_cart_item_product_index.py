@@ -0,0 +1,26 @@
+"""cart_item product_id index
+
+Revision ID: f2c95d7e4a61
+Revises: e4b7f1a20c38
+Create Date: 2026-10-18 15:02:19.774530
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c95d7e4a61'
+down_revision = 'e4b7f1a20c38'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.create_index('ix_cart_item_product', ['product_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('cart_item', schema=None) as batch_op:
+        batch_op.drop_index('ix_cart_item_product')
@@ -1,4 +1,6 @@
-from flask import Flask, g, session
+import os
+
+from flask import Flask
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
@@ -8,9 +10,18 @@ db = SQLAlchemy()
 migrate = Migrate()
 
 
-def create_app():
+def create_app(config_name=None, overrides=None):
     app = Flask(__name__)
     app.config.from_object(config)
+
+    # 환경별 프로필 (development / production)
+    config_name = config_name or os.environ.get('SPROUT_ENV', config.DEFAULT_PROFILE)
+    app.config.update(config.PROFILES[config_name])
+    app.config['PROFILE'] = config_name
+
+    # 벤치마크 등에서 DB 경로/카탈로그 파일 등을 바꿔서 쓸 때
+    if overrides:
+        app.config.update(overrides)
     app.config['SECRET_KEY'] = '4565656246565'
 
     # 세션 쿠키 설정 추가 (중요!)
@@ -18,30 +29,61 @@ def create_app():
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
     app.config['PERMANENT_SESSION_LIFETIME'] = 3600  # 1시간
 
+    # 응답 압축: after_request 는 등록 역순으로 실행되므로 가장 먼저 등록해서 마지막에 압축되게 한다
+    from .compression import init_compression
+    init_compression(app)
+
+    # 로그 (큐 + 백그라운드 writer 스레드, JSON 포맷)
+    from .log import init_logging
+    init_logging(app)
+
     # ORM
     db.init_app(app)
     migrate.init_app(app, db)
+
+    # SQLite PRAGMA / 커넥션 풀 프로필 적용 + flask check-db 명령
+    from .database import init_database_profile
+    init_database_profile(app)
     from . import models
 
+    # 요청별 쿼리/템플릿 시간 측정 (PROFILING_ENABLED 일 때만, Server-Timing + /__metrics)
+    from .profiling import init_profiling
+    init_profiling(app)
+
+    # 상품 카탈로그 (프로세스 상주)
+    from .catalog import catalog
+    catalog.init_app(app)
+
+    # 비밀번호 해시 (동시 실행 수 제한 + 해시 설정)
+    from .hashing import password_hasher
+    password_hasher.init_app(app)
+
+    # 반응형 이미지 파생본 (flask build-images + responsive_image 템플릿 헬퍼)
+    from .images import init_images
+    init_images(app)
+
+    # CSS/JS 번들 (flask build-assets + asset_url 템플릿 헬퍼 + /assets/ 미리 압축된 파일 제공)
+    from .assets import init_assets
+    init_assets(app)
+
+    # Jinja 바이트코드 캐시 (템플릿 컴파일 결과를 디스크에 저장 + flask compile-templates)
+    from .templating import init_templates
+    init_templates(app)
+
     # 블루프린트 등록
     from .views import main_views, auth_views, product_views, user_views
     app.register_blueprint(main_views.bp)
     app.register_blueprint(auth_views.bp)
     app.register_blueprint(product_views.bp)
     app.register_blueprint(user_views.bp)
+    app.add_url_rule('/product_detail', 'product_detail', product_views.product_detail)
+
+    # 로그인 사용자 정보는 auth_views.load_logged_in_user 한 곳에서만 불러온다 (프로세스별 캐시 사용)
+    from .identity import configure_identity_cache
+    configure_identity_cache(app)
 
-    # DB에서 로그인 사용자 정보 불러오기
-    @app.before_request
-    def load_logged_in_user():
-        user_id = session.get('user_id')
-        if user_id is None:
-            g.user = None
-        else:
-            from .models import User
-            g.user = User.query.get(user_id)
-            if g.user:
-                print(f"✓ 사용자 로드됨: {g.user.username} (ID: {g.user.id})")
-            else:
-                print(f"⚠ User ID {user_id}를 찾을 수 없음")
+    # /cart/check 용 사용자별 장바구니 상품 id 캐시 (cart_version 으로 검증, 장바구니 변경 시 write-through)
+    from .cart import configure_membership_cache
+    configure_membership_cache(app)
 
     return app
\ No newline at end of file
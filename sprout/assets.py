@@ -0,0 +1,263 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import threading
+import time
+
+import click
+from flask import abort, current_app, request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# ========== 정적 자산 번들 ==========
+# ASSET_BUNDLES 에 정의된 CSS/JS 를 이어 붙이고 줄여서 static/dist 에 내용 해시가 들어간 이름으로 저장한다.
+# 옆에 .gz (brotli 가 설치되어 있으면 .br 도) 를 미리 만들어 두고, /assets/ 에서 Accept-Encoding 에 맞춰
+# 그대로 내보낸다. 이름이 내용에 따라 바뀌므로 Cache-Control: immutable 로 1년 캐시한다.
+#   flask build-assets
+# 템플릿에서는 {{ asset_url('sub.css') }} 로 쓰고, 빌드 전(개발 중)에는 원본을 이어 붙여 매번 새로 내보낸다.
+
+MANIFEST_NAME = 'manifest.json'
+IMMUTABLE = 'public, max-age={max_age}, immutable'
+
+
+# ---------- 압축(minify) ----------
+# 외부 도구 없이 안전한 범위만 줄인다 (주석/들여쓰기/빈 줄). 나머지는 gzip/brotli 가 처리한다.
+CSS_STRING = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+CSS_TOKENS = re.compile(f'({CSS_STRING}|/\\*.*?\\*/)', re.S)
+CSS_SPACE = re.compile(r'\s+')
+CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+
+def minify_css(text):
+    # 문자열(data URI 의 SVG 등)은 건드리지 않고 줄 잇기(\ + 줄바꿈)만 없애며, 주석은 지운다
+    parts = CSS_TOKENS.split(text)
+    code = []
+    strings = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            code.append(part)
+        elif not part.startswith('/*'):
+            # 문자열 자리를 표시해 두고 나머지만 한 번에 줄인다
+            code.append(f'\0{len(strings)}\0')
+            strings.append(part.replace('\\\n', ''))
+
+    text = CSS_SPACE.sub(' ', ''.join(code))
+    text = CSS_PUNCTUATION.sub(r'\1', text)
+    # ':' 앞 공백은 선택자(a :hover)에서 의미가 있으므로 선언의 ':' 뒤 공백만 없앤다
+    text = re.sub(r'([{;][-\w]+):\s+', r'\1:', text)
+    text = re.sub('\0(\\d+)\0', lambda m: strings[int(m.group(1))], text)
+    return text.replace(';}', '}').strip()
+
+
+def minify_js(text):
+    # 문자열/정규식 안의 // 를 잘못 지우지 않도록 줄 전체가 주석인 경우만 제거하고, 줄바꿈은 유지한다 (ASI)
+    lines = []
+    in_block_comment = False
+    for line in text.splitlines():
+        stripped = line.strip()
+        if in_block_comment:
+            if '*/' in stripped:
+                in_block_comment = False
+                stripped = stripped.split('*/', 1)[1].strip()
+            else:
+                continue
+        if stripped.startswith('/*'):
+            if '*/' not in stripped:
+                in_block_comment = True
+                continue
+            stripped = stripped.split('*/', 1)[1].strip()
+        if not stripped or stripped.startswith('//'):
+            continue
+        lines.append(stripped)
+    return '\n'.join(lines)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def _bundle_source(app, name):
+    sources = app.config['ASSET_BUNDLES'][name]
+    parts = []
+    for source in sources:
+        with open(os.path.join(app.static_folder, source), 'r', encoding='utf-8') as f:
+            parts.append(f.read())
+    # 앞 파일이 세미콜론 없이 끝나도 이어 붙인 JS 가 깨지지 않도록
+    separator = '\n;\n' if name.endswith('.js') else '\n'
+    return separator.join(parts)
+
+
+# ---------- 빌드 ----------
+def _dist_dir(app):
+    return os.path.join(app.static_folder, app.config.get('ASSET_DIST_DIR', 'dist'))
+
+
+def build_assets(app, log=click.echo):
+    dist_dir = _dist_dir(app)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    manifest = {}
+    for name in app.config['ASSET_BUNDLES']:
+        stem, ext = os.path.splitext(name)
+        source = _bundle_source(app, name)
+        minified = MINIFIERS.get(ext, lambda text: text)(source).encode('utf-8')
+
+        filename = f'{stem}.{hashlib.sha1(minified).hexdigest()[:10]}{ext}'
+        path = os.path.join(dist_dir, filename)
+        if not os.path.exists(path):
+            with open(path, 'wb') as f:
+                f.write(minified)
+            with open(path + '.gz', 'wb') as f:
+                # mtime=0: 같은 내용이면 같은 .gz 가 나오도록
+                f.write(gzip.compress(minified, compresslevel=9, mtime=0))
+            if brotli is not None:
+                with open(path + '.br', 'wb') as f:
+                    f.write(brotli.compress(minified, quality=11))
+        manifest[name] = filename
+
+        sizes = [f'원본 {len(source.encode("utf-8"))}B', f'minify {len(minified)}B',
+                 f'gzip {os.path.getsize(path + ".gz")}B']
+        if os.path.exists(path + '.br'):
+            sizes.append(f'br {os.path.getsize(path + ".br")}B')
+        log(f'  {name:12s} → {filename}  ({", ".join(sizes)})')
+
+    manifest_path = os.path.join(dist_dir, MANIFEST_NAME)
+    with open(manifest_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+    # 이전 빌드의 파일 정리
+    keep = set(manifest.values())
+    removed = 0
+    for filename in os.listdir(dist_dir):
+        base = filename[:-3] if filename.endswith(('.gz', '.br')) else filename
+        if filename != MANIFEST_NAME and base not in keep:
+            os.remove(os.path.join(dist_dir, filename))
+            removed += 1
+
+    if brotli is None:
+        log('brotli 가 설치되어 있지 않아 .br 파일은 만들지 않았습니다 (pip install brotli)')
+    log(f'완료: 번들 {len(manifest)}개, {time.perf_counter() - started:.2f}초, 오래된 파일 {removed}개 삭제')
+    return manifest
+
+
+@click.command('build-assets')
+def build_assets_command():
+    """ASSET_BUNDLES 의 CSS/JS 를 줄이고 압축해서 static/dist 에 지문(해시) 이름으로 저장한다."""
+    build_assets(current_app)
+
+
+# ========== 매니페스트 / 템플릿 헬퍼 ==========
+def manifest_digest(data):
+    if not data:
+        return ''
+    return hashlib.sha1(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+class AssetManifest:
+    def __init__(self, check_interval=1.0):
+        self.path = None
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self.bundles = {}
+        self.files = set()
+        self.digest = ''  # 페이지 ETag 에 넣는 매니페스트 해시 (번들이 다시 빌드되면 바뀐다)
+
+    def refresh(self):
+        # 배포 중 build-assets 를 다시 실행해도 재시작 없이 반영되도록 파일 변경을 주기적으로 확인한다
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+                signature = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                signature = None
+            if signature != self._signature:
+                bundles = {}
+                if signature is not None:
+                    try:
+                        with open(self.path, 'r', encoding='utf-8') as f:
+                            bundles = json.load(f)
+                    except json.JSONDecodeError:
+                        bundles = self.bundles
+                self.bundles = bundles
+                self.files = set(bundles.values())
+                self.digest = manifest_digest(bundles)
+                self._signature = signature
+            self._checked_at = now
+        return self
+
+
+asset_manifest = AssetManifest()
+
+
+def asset_url(name):
+    filename = asset_manifest.refresh().bundles.get(name, name)
+    return url_for('assets', filename=filename)
+
+
+# ========== /assets/ 핸들러 ==========
+def _accepts(encoding):
+    return request.accept_encodings[encoding] > 0
+
+
+def serve_asset(filename):
+    app = current_app
+    manifest = asset_manifest.refresh()
+
+    if filename in manifest.files:
+        dist_dir = _dist_dir(app)
+        mimetype = mimetypes.guess_type(filename)[0]
+        encoding = None
+        for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+            if _accepts(candidate) and os.path.exists(os.path.join(dist_dir, filename + suffix)):
+                encoding = candidate
+                filename += suffix
+                break
+
+        response = send_from_directory(dist_dir, filename, mimetype=mimetype, conditional=True)
+        # .gz/.br 파일 이름이 아니라 원래 자산으로 보이도록
+        response.headers.pop('Content-Disposition', None)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE.format(max_age=app.config.get('ASSET_MAX_AGE', 31536000))
+        return response
+
+    # 빌드 전(개발 중): 번들 원본을 이어 붙여 그대로 내보낸다 (파일을 고치면 바로 반영)
+    if filename in app.config['ASSET_BUNDLES']:
+        response = app.response_class(_bundle_source(app, filename),
+                                      mimetype=mimetypes.guess_type(filename)[0])
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    abort(404)
+
+
+def _immutable_static(response):
+    # 내용 해시가 들어간 이미지 파생본(build-images)도 재검증 없이 캐시하게 한다
+    if request.endpoint == 'static' and response.status_code == 200:
+        prefix = current_app.config.get('IMAGE_DERIVED_DIR', 'image/derived').rstrip('/') + '/'
+        if (request.view_args or {}).get('filename', '').startswith(prefix):
+            max_age = current_app.config.get('ASSET_MAX_AGE', 31536000)
+            response.headers['Cache-Control'] = IMMUTABLE.format(max_age=max_age)
+    return response
+
+
+def init_assets(app):
+    app.cli.add_command(build_assets_command)
+    asset_manifest.path = os.path.join(_dist_dir(app), MANIFEST_NAME)
+    app.add_url_rule('/assets/<path:filename>', 'assets', serve_asset)
+    app.after_request(_immutable_static)
+    app.jinja_env.globals['asset_url'] = asset_url
@@ -0,0 +1,119 @@
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from sprout import db
+from sprout.cache import LRUCache
+from sprout.models import CartItem, Product, User
+
+
+# ========== 장바구니 변경 (집합 단위) ==========
+# 추가/삭제를 한 트랜잭션 안에서 문장 몇 개로 처리한다.
+#   - 상품 정보는 IN 으로 한 번에 조회
+#   - 추가는 (user_id, product_id) 유니크 인덱스 기준 충돌 무시 bulk insert
+#   - 삭제는 DELETE ... WHERE product_id IN (...) 한 번
+# 커밋은 호출한 쪽에서 한다.
+
+def _insert_ignore():
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(CartItem.__table__).on_conflict_do_nothing(index_elements=['user_id', 'product_id'])
+
+
+# 장바구니가 바뀔 때마다 사용자별 cart_version 을 올린다 (/cart/check 의 ETag, 상품 id 캐시 검증에 사용)
+def bump_cart_version(user_id):
+    return db.session.scalar(
+        db.update(User).where(User.id == user_id).values(cart_version=User.cart_version + 1)
+        .returning(User.cart_version)
+    )
+
+
+def add_items(user, product_ids):
+    """상품들을 장바구니에 추가하고 (추가된 수, 존재하지 않는 상품 id 목록, 장바구니에 들어 있게 된 상품 id) 를 돌려준다."""
+    if not product_ids:
+        return 0, [], set()
+
+    products = db.session.scalars(db.select(Product).where(Product.id.in_(product_ids))).all()
+    found = {p.id for p in products}
+    not_found = [pid for pid in product_ids if pid not in found]
+    if not products:
+        return 0, not_found, set()
+
+    # CartItem 에 상품 정보 + username 을 스냅샷으로 함께 저장
+    rows = [{
+        'user_id': user.id,
+        'username': user.username,
+        'product_id': p.id,
+        'brand': p.brand,
+        'name': p.name,
+        'price': p.price,
+        'description': p.description,
+        'image_url': p.image_url,
+        'style': p.style,
+    } for p in products]
+    result = db.session.execute(_insert_ignore(), rows)
+    return max(result.rowcount, 0), not_found, found
+
+
+def remove_items(user, product_ids):
+    """장바구니에서 상품들을 삭제하고 삭제된 수를 돌려준다."""
+    if not product_ids:
+        return 0
+    result = db.session.execute(
+        db.delete(CartItem).where(CartItem.user_id == user.id, CartItem.product_id.in_(product_ids))
+    )
+    return result.rowcount
+
+
+def apply_changes(user, add_ids=(), remove_ids=()):
+    added, not_found, present = add_items(user, list(add_ids))
+    removed = remove_items(user, list(remove_ids))
+    if added or removed:
+        version = bump_cart_version(user.id)
+        # 커밋된 뒤에 상품 id 캐시에 반영한다 (롤백되면 버림)
+        db.session.info.setdefault(PENDING_KEY, []).append((user.id, version, present, set(remove_ids)))
+    return added, removed, not_found
+
+
+# ========== 장바구니 상품 id 캐시 (/cart/check) ==========
+# 사용자별 (cart_version, 상품 id frozenset) 을 프로세스별 LRU 에 둔다.
+# DB 의 cart_version 과 같을 때만 쓰므로 다른 워커에서 바뀐 장바구니도 바로 다시 읽는다.
+# 이 프로세스에서 바꾼 장바구니는 커밋 직후 캐시에도 같은 변경을 적용한다 (write-through).
+PENDING_KEY = 'cart_membership_pending'
+membership_cache = LRUCache()
+
+
+def configure_membership_cache(app):
+    membership_cache.configure(
+        app.config.get('CART_MEMBERSHIP_CACHE_SIZE', 4096),
+        app.config.get('CART_MEMBERSHIP_CACHE_TTL', 3600),
+    )
+
+
+def cart_product_ids(user_id, cart_version):
+    entry = membership_cache.get(user_id)
+    if entry is not None and entry[0] == cart_version:
+        return entry[1]
+
+    # 캐시에 없으면 product_id 컬럼만 조회한다
+    ids = frozenset(db.session.scalars(db.select(CartItem.product_id).where(CartItem.user_id == user_id)))
+    membership_cache.set(user_id, (cart_version, ids))
+    return ids
+
+
+@event.listens_for(Session, 'after_commit')
+def _write_through(session):
+    for user_id, version, present, removed in session.info.pop(PENDING_KEY, ()):
+        entry = membership_cache.get(user_id)
+        # 캐시가 바로 이전 버전일 때만 변경분을 적용한다 (그 사이 다른 곳에서 바뀌었으면 버림)
+        if entry is not None and version is not None and entry[0] == version - 1:
+            membership_cache.set(user_id, (version, (entry[1] | present) - removed))
+        else:
+            membership_cache.pop(user_id)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending(session):
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,437 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+# ========== 비트셋 유틸 ==========
+def bits_from_positions(positions, size):
+    # 큰 정수에 비트를 하나씩 OR 하면 O(n^2) 이므로 바이트 배열을 채운 뒤 한 번에 변환한다
+    buf = bytearray((size + 7) // 8)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buf, 'little')
+
+
+# ========== 상품 행 정규화 ==========
+# JSON 로드와 컬럼형 컴파일(sprout/columnar.py)이 같은 규칙을 쓴다.
+# 두 경로는 같은 카탈로그 버전(ETag, 그리드 캐시 키)을 쓰므로 결과도 같아야 한다.
+def normalize_product(item):
+    """카탈로그에 넣을 상품 dict 를 돌려준다. id 가 정수가 아니거나 가격이 숫자가 아니면 None (건너뜀)"""
+    product_id = item.get('id') if isinstance(item, dict) else None
+    if not isinstance(product_id, int) or isinstance(product_id, bool):
+        return None
+    try:
+        price = int(item.get('price') or 0)
+    except (TypeError, ValueError):
+        return None
+    return {
+        'id': product_id,
+        'brand': item.get('brand'),
+        'name': item.get('name') or '',
+        'price': price,
+        'description': item.get('description') or '',
+        'image_url': item.get('image_url') or '',
+        'style': item.get('style'),
+    }
+
+
+def lower_name(name):
+    # 컬럼형 파일은 이름을 '\0' 으로 이어 저장하므로 검색용 이름에서는 '\0' 을 뺀다
+    return (name or '').replace('\0', '').lower()
+
+
+# ========== 가격 히스토그램 ==========
+# 카탈로그 전체 가격 범위를 같은 폭의 구간으로 나누고, (스타일, 브랜드) 조합별 구간 카운트를 미리 세어 둔다.
+# 한 상품은 스타일/브랜드를 하나씩만 가지므로 여러 값을 선택해도 조합별 카운트를 더하기만 하면 된다.
+PRICE_BUCKETS = 20
+
+
+def price_edges(sorted_prices, buckets=PRICE_BUCKETS):
+    if not len(sorted_prices):
+        return []
+    low, high = sorted_prices[0], sorted_prices[-1]
+    if low == high:
+        return [low, high]
+    return [low + (high - low) * i // buckets for i in range(buckets + 1)]
+
+
+def price_bucket(edges, price):
+    # 마지막 구간은 최고가를 포함한다
+    return min(bisect.bisect_right(edges, price) - 1, len(edges) - 2)
+
+
+def price_histograms(prices, style_keys, brand_keys, edges):
+    table = {}
+    for price, style, brand in zip(prices, style_keys, brand_keys):
+        counts = table.get((style, brand))
+        if counts is None:
+            counts = table[(style, brand)] = [0] * (len(edges) - 1)
+        counts[price_bucket(edges, price)] += 1
+    return table
+
+
+# ========== 카탈로그 스냅샷 ==========
+# 한 번 만들어지면 바뀌지 않는 객체. 리로드 시에는 새 스냅샷을 만들어 참조만 교체한다.
+# 로드 시점에 필터/정렬용 인덱스를 미리 계산해 둔다.
+#   - style_bits / brand_bits: 값별 포스팅 비트셋 (i번째 비트 = 카탈로그 i번째 상품)
+#   - price_asc / price_desc: 가격순으로 정렬된 상품 위치 순열
+#   - price_values: price_asc 순서의 가격 (가격 범위는 이진 탐색으로 price_asc 의 구간이 된다)
+#   - price_edges / price_histograms: 가격 히스토그램 구간 경계와 (스타일, 브랜드) 조합별 카운트
+# 컬럼형 카탈로그 파일(sprout/columnar.py)에서 열 때는 미리 계산된 인덱스를 indexes 로 넘겨받는다.
+def build_indexes(products):
+    size = len(products)
+    style_positions = {}
+    brand_positions = {}
+    for i, p in enumerate(products):
+        style_positions.setdefault((p.get('style') or '').strip(), []).append(i)
+        brand_positions.setdefault((p.get('brand') or '').strip(), []).append(i)
+
+    # 정렬은 안정 정렬이므로 같은 가격이면 카탈로그 순서를 유지한다 (기존 list.sort 와 동일)
+    prices = [p.get('price', 0) for p in products]
+    price_asc = sorted(range(size), key=prices.__getitem__)
+    price_values = [prices[i] for i in price_asc]
+    edges = price_edges(price_values)
+    return {
+        'by_id': {p.get('id'): p for p in products},
+        'style_bits': {k: bits_from_positions(v, size) for k, v in style_positions.items()},
+        'brand_bits': {k: bits_from_positions(v, size) for k, v in brand_positions.items()},
+        # 필터가 없을 때의 패싯 카운트 (스냅샷이 만들어질 때 한 번만 계산)
+        'style_counts': {k: len(v) for k, v in style_positions.items()},
+        'brand_counts': {k: len(v) for k, v in brand_positions.items()},
+        'price_asc': price_asc,
+        'price_desc': sorted(range(size), key=prices.__getitem__, reverse=True),
+        'price_values': price_values,
+        'price_edges': edges,
+        'price_histograms': price_histograms(
+            prices, [(p.get('style') or '').strip() for p in products],
+            [(p.get('brand') or '').strip() for p in products], edges),
+        'names': lambda: [lower_name(p.get('name')) for p in products],
+    }
+
+
+class CatalogSnapshot:
+    SEARCH_CACHE_SIZE = 256
+
+    def __init__(self, products, version, indexes=None):
+        if indexes is None:
+            indexes = build_indexes(products)
+        self.products = products
+        self.version = version
+        self.by_id = indexes['by_id']
+
+        self.all_bits = (1 << len(products)) - 1
+        self.style_bits = indexes['style_bits']
+        self.brand_bits = indexes['brand_bits']
+        self.style_counts = indexes['style_counts']
+        self.brand_counts = indexes['brand_counts']
+        self.price_asc = indexes['price_asc']
+        self.price_desc = indexes['price_desc']
+        self.price_values = indexes['price_values']
+        self.price_edges = indexes['price_edges']
+        self.price_histograms = indexes['price_histograms']
+        self._price_cache = {}
+        self._bucket_bits = None
+
+        # 검색용 소문자 이름은 첫 검색 때 만든다
+        self._load_names = indexes['names']
+        self._names = None
+        self._search_cache = {}
+        self._search_lock = threading.Lock()
+
+    def warm(self):
+        # 운영 서버(preload)에서 fork 전에 미리 만들어 두면 워커들이 공유한다
+        self._lower_names()
+        return self
+
+    def _lower_names(self):
+        if self._names is None:
+            with self._search_lock:
+                if self._names is None:
+                    self._names = self._load_names()
+        return self._names
+
+    def __len__(self):
+        return len(self.products)
+
+    # ---------- 비트셋 계산 ----------
+    def _union(self, index, values):
+        bits = 0
+        for value in values:
+            bits |= index.get(value, 0)
+        return bits
+
+    def search_bits(self, query):
+        # 부분 문자열 검색은 스캔이 필요하므로 검색어별 결과 비트셋을 캐시한다
+        bits = self._search_cache.get(query)
+        if bits is not None:
+            return bits
+
+        names = self._lower_names()
+        positions = [i for i, name in enumerate(names) if query in name]
+        bits = bits_from_positions(positions, len(names))
+
+        with self._search_lock:
+            if len(self._search_cache) >= self.SEARCH_CACHE_SIZE:
+                self._search_cache.pop(next(iter(self._search_cache)))
+            self._search_cache[query] = bits
+        return bits
+
+    def price_bounds(self, min_price=None, max_price=None):
+        # 가격 범위 → price_asc 의 [lo, hi) 구간 (이진 탐색)
+        lo = bisect.bisect_left(self.price_values, min_price) if min_price is not None else 0
+        hi = bisect.bisect_right(self.price_values, max_price) if max_price is not None else len(self.products)
+        return lo, max(lo, hi)
+
+    def price_bits(self, min_price=None, max_price=None):
+        lo, hi = self.price_bounds(min_price, max_price)
+        if lo == 0 and hi == len(self.products):
+            return self.all_bits
+
+        # 범위 안의 상품 위치만 비트로 옮기므로 범위가 좁을수록 빠르다. 같은 구간은 캐시한다
+        bits = self._price_cache.get((lo, hi))
+        if bits is None:
+            bits = bits_from_positions(self.price_asc[lo:hi], len(self.products))
+            with self._search_lock:
+                if len(self._price_cache) >= self.SEARCH_CACHE_SIZE:
+                    self._price_cache.pop(next(iter(self._price_cache)))
+                self._price_cache[(lo, hi)] = bits
+        return bits
+
+    def filter_bits(self, search='', styles=(), brands=(), min_price=None, max_price=None):
+        bits = self.all_bits
+        if styles:
+            bits &= self._union(self.style_bits, styles)
+        if brands:
+            bits &= self._union(self.brand_bits, brands)
+        if (min_price is not None or max_price is not None) and bits:
+            bits &= self.price_bits(min_price, max_price)
+        if search and bits:
+            bits &= self.search_bits(search)
+        return bits
+
+    # ---------- 패싯 카운트 ----------
+    # 각 패싯의 카운트는 "자기 자신을 제외한" 나머지 조건(검색어 + 다른 패싯 선택)에 대해 계산한다.
+    # 값별 비트셋과 AND 후 popcount 만 하므로 카탈로그 전체를 순회하지 않는다.
+    def _counts(self, index, base_bits, unfiltered):
+        if base_bits == self.all_bits:
+            return dict(unfiltered)
+        return {value: (bits & base_bits).bit_count() for value, bits in index.items()}
+
+    def facet_counts(self, search='', styles=(), brands=(), min_price=None, max_price=None):
+        return {
+            'styles': self._counts(self.style_bits, self.filter_bits(search, (), brands, min_price, max_price),
+                                   self.style_counts),
+            'brands': self._counts(self.brand_bits, self.filter_bits(search, styles, (), min_price, max_price),
+                                   self.brand_counts),
+        }
+
+    # ---------- 가격 히스토그램 ----------
+    # 가격 조건은 빼고 센다 (슬라이더에는 선택한 범위 밖의 분포도 보여야 하므로)
+    def _price_bucket_bits(self):
+        # 검색어가 있을 때만 쓰는 구간별 비트셋 (처음 필요할 때 한 번 만든다)
+        if self._bucket_bits is None:
+            edges = self.price_edges
+            bucket_bits = []
+            for i in range(len(edges) - 1):
+                lo = bisect.bisect_left(self.price_values, edges[i])
+                if i == len(edges) - 2:
+                    hi = len(self.products)
+                else:
+                    hi = bisect.bisect_left(self.price_values, edges[i + 1])
+                bucket_bits.append(bits_from_positions(self.price_asc[lo:max(lo, hi)], len(self.products)))
+            self._bucket_bits = bucket_bits
+        return self._bucket_bits
+
+    def price_histogram(self, search='', styles=(), brands=()):
+        if search:
+            base = self.filter_bits(search, styles, brands)
+            counts = [(base & bits).bit_count() for bits in self._price_bucket_bits()]
+        else:
+            # 미리 센 (스타일, 브랜드) 조합별 카운트를 더한다
+            styles, brands = set(styles), set(brands)
+            counts = [0] * max(len(self.price_edges) - 1, 0)
+            for (style, brand), pair_counts in self.price_histograms.items():
+                if (not styles or style in styles) and (not brands or brand in brands):
+                    for i, n in enumerate(pair_counts):
+                        counts[i] += n
+        return {'edges': list(self.price_edges), 'counts': counts}
+
+    # ---------- 조회 ----------
+    def query(self, search='', styles=(), brands=(), sort='default', offset=0, limit=25,
+              min_price=None, max_price=None):
+        bits = self.filter_bits(search, styles, brands, min_price, max_price)
+        total = bits.bit_count()
+        if not total or offset >= total:
+            return [], total
+
+        # 가격순 정렬이면 가격 범위에 해당하는 구간만 따라간다 (내림차순에서도 범위는 연속 구간)
+        size = len(self.products)
+        lo, hi = self.price_bounds(min_price, max_price)
+        narrowed = (lo, hi) != (0, size)
+        if sort == 'price_low':
+            order = self.price_asc[lo:hi] if narrowed else self.price_asc
+        elif sort == 'price_high':
+            order = self.price_desc[size - hi:size - lo] if narrowed else self.price_desc
+        else:
+            order = range(size)
+
+        # 미리 정렬된 순서를 따라가며 필터 비트가 켜진 상품만 골라낸다 (요청마다 정렬하지 않음)
+        # 순서에 든 상품 수가 결과 수와 같으면 순서 자체가 결과이므로 바로 자른다
+        if len(order) == total:
+            positions = order[offset:offset + limit]
+        else:
+            mask = bits.to_bytes((len(self.products) + 7) // 8, 'little')
+            positions = []
+            skipped = 0
+            for i in order:
+                if mask[i >> 3] >> (i & 7) & 1:
+                    if skipped < offset:
+                        skipped += 1
+                        continue
+                    positions.append(i)
+                    if len(positions) >= limit:
+                        break
+
+        return [self.products[i] for i in positions], total
+
+
+# ========== 프로세스 상주 상품 카탈로그 ==========
+class ProductCatalog:
+    def __init__(self, path=None, check_interval=1.0, columnar_path=None):
+        self.path = path
+        self.columnar_path = columnar_path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self._snapshot = CatalogSnapshot([], '0')
+        self.source = None  # 'json' 또는 'columnar'
+
+        # 모니터링용 카운터
+        self.hits = 0
+        self.reloads = 0
+        self.errors = 0
+
+    def init_app(self, app):
+        self.path = app.config['PRODUCTS_JSON_PATH']
+        self.check_interval = app.config.get('CATALOG_CHECK_INTERVAL', 1.0)
+        self.columnar_path = app.config.get('CATALOG_COLUMNAR_PATH')
+        app.extensions['catalog'] = self
+
+        from .columnar import compile_catalog_command
+        app.cli.add_command(compile_catalog_command)
+
+    def _stat(self):
+        # (JSON mtime, JSON size, 컬럼형 파일 mtime) — 컬럼형 파일만 다시 만들어도 리로드된다
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        columnar_mtime = None
+        if self.columnar_path:
+            try:
+                columnar_mtime = os.stat(self.columnar_path).st_mtime_ns
+            except OSError:
+                pass
+        return st.st_mtime_ns, st.st_size, columnar_mtime
+
+    def _load_columnar(self, signature):
+        # 컬럼형 파일이 지금의 products.json 으로 만들어졌을 때만 쓴다 (아니면 JSON 으로 로드)
+        if signature[2] is None:
+            return None
+        from .columnar import ColumnarProducts, ColumnarTable, load_indexes
+        try:
+            table = ColumnarTable(self.columnar_path)
+        except (OSError, ValueError) as e:
+            logger.error('컬럼형 카탈로그를 열 수 없습니다: %s', e)
+            return None
+        if table.source_signature != signature[:2]:
+            logger.warning('%s 가 %s 보다 오래되었습니다. flask compile-catalog 로 다시 만드세요',
+                           self.columnar_path, self.path)
+            return None
+        return ColumnarProducts(table), load_indexes(table)
+
+    def _load(self, signature):
+        version = f'{signature[0]:x}-{signature[1]:x}'
+        columnar = self._load_columnar(signature)
+        if columnar is not None:
+            products, indexes = columnar
+            self._snapshot = CatalogSnapshot(products, version, indexes)
+            self.source = 'columnar'
+            self.reloads += 1
+            logger.info('카탈로그 로드 완료 (컬럼형): %d개 (version=%s)', len(products), version)
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                items = json.load(f).get('products', [])
+        except FileNotFoundError:
+            logger.error('%s 파일을 찾을 수 없습니다!', self.path)
+            self.errors += 1
+            return
+        except json.JSONDecodeError as e:
+            # 파일이 쓰이는 도중일 수 있으므로 기존 스냅샷을 유지한다
+            logger.error('JSON 파싱 오류: %s', e)
+            self.errors += 1
+            return
+
+        products = [p for p in map(normalize_product, items) if p is not None]
+        if len(products) != len(items):
+            logger.warning('id 가 정수가 아니거나 가격이 잘못된 상품 %d개를 건너뜁니다', len(items) - len(products))
+        self._snapshot = CatalogSnapshot(products, version)
+        self.source = 'json'
+        self.reloads += 1
+        logger.info('카탈로그 로드 완료: %d개 (version=%s)', len(products), version)
+
+    def snapshot(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval and self._signature is not None:
+            self.hits += 1
+            return self._snapshot
+
+        signature = self._stat()
+        if signature == self._signature:
+            self._checked_at = now
+            self.hits += 1
+            return self._snapshot
+
+        with self._lock:
+            # 다른 스레드가 먼저 리로드했을 수 있음
+            if signature != self._signature:
+                if signature is not None:
+                    self._load(signature)
+                else:
+                    logger.error('%s 파일을 찾을 수 없습니다!', self.path)
+                    self.errors += 1
+                self._signature = signature
+            self._checked_at = now
+        return self._snapshot
+
+    def products(self):
+        return self.snapshot().products
+
+    def get(self, product_id):
+        return self.snapshot().by_id.get(product_id)
+
+    @property
+    def version(self):
+        return self.snapshot().version
+
+    def stats(self):
+        return {
+            'path': self.path,
+            'source': self.source,
+            'version': self._snapshot.version,
+            'products': len(self._snapshot),
+            'hits': self.hits,
+            'reloads': self.reloads,
+            'errors': self.errors,
+        }
+
+
+catalog = ProductCatalog()
@@ -0,0 +1,318 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+
+import click
+from flask import current_app
+
+
+# ========== 컬럼형 카탈로그 파일 ==========
+# products.json 을 컬럼별 바이너리로 바꿔 둔 파일. mmap 으로 열기 때문에 로드가 거의 즉시 끝나고,
+# 여러 워커가 같은 페이지 캐시를 공유한다 (상품마다 dict 를 만들지 않음).
+#
+#   헤더: MAGIC, 포맷 버전, 상품 수, 원본 JSON 의 (mtime_ns, size), 섹션 수, 섹션 목록(이름/위치/길이)
+#   섹션 (8바이트 정렬):
+#     id, price                   int64 배열
+#     id_sorted / id_pos          id 오름차순 정렬값과 그 위치 (id 조회는 이진 탐색)
+#     price_asc / price_desc      가격순 위치 순열 (CatalogSnapshot 과 같은 안정 정렬)
+#     price_values                price_asc 순서의 가격 (가격 범위 이진 탐색용)
+#     price_edges / price_histograms   가격 히스토그램 구간 경계와 (스타일, 브랜드) 조합별 카운트 (JSON)
+#     style_code / brand_code     값 테이블(style_values / brand_values, JSON) 의 번호
+#     style_index / brand_index   필터 키(앞뒤 공백 제거) 목록과 키별 비트맵(style_bits / brand_bits)
+#     name / description / image_url   UTF-8 blob + 시작 위치 배열(*_off, 상품 수 + 1)
+#     name_lower                  검색용 소문자 이름 ('\0' 으로 구분)
+# 상품 행은 JSON 로드와 같은 규칙(catalog.normalize_product)으로 정규화한다 (잘못된 행은 양쪽 모두 건너뜀).
+
+MAGIC = b'SPRCAT\x00\x01'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<8sIIqqI')
+SECTION = struct.Struct('<16sQQ')
+NO_VALUE = 0xFFFFFFFF
+
+FIELDS = ('id', 'brand', 'name', 'price', 'description', 'image_url', 'style')
+BLOB_FIELDS = ('name', 'description', 'image_url')
+CODED_FIELDS = ('brand', 'style')
+
+
+# ---------- 컴파일 ----------
+def _blob(values):
+    offsets = array('Q', [0])
+    parts = []
+    total = 0
+    for value in values:
+        data = (value or '').encode('utf-8')
+        parts.append(data)
+        total += len(data)
+        offsets.append(total)
+    return offsets, b''.join(parts)
+
+
+def _bitmap(positions, size):
+    buf = bytearray((size + 7) // 8)
+    for i in positions:
+        buf[i >> 3] |= 1 << (i & 7)
+    return bytes(buf)
+
+
+def compile_catalog(json_path, out_path):
+    """products.json 을 컬럼형 카탈로그 파일로 만든다. 반환값: 저장한 상품 수"""
+    from sprout.catalog import lower_name, normalize_product, price_edges, price_histograms
+    from sprout.sync import iter_products
+
+    st = os.stat(json_path)
+    ids = array('q')
+    prices = array('q')
+    columns = {field: [] for field in BLOB_FIELDS}
+    value_tables = {field: {} for field in CODED_FIELDS}
+    codes = {field: array('I') for field in CODED_FIELDS}
+    index_positions = {field: {} for field in CODED_FIELDS}
+    filter_keys = {field: [] for field in CODED_FIELDS}
+
+    for item in iter_products(json_path):
+        item = normalize_product(item)
+        if item is None:
+            continue
+        position = len(ids)
+        ids.append(item['id'])
+        prices.append(item['price'])
+        for field in BLOB_FIELDS:
+            columns[field].append(item.get(field))
+        for field in CODED_FIELDS:
+            value = item.get(field)
+            if value is None:
+                codes[field].append(NO_VALUE)
+            else:
+                codes[field].append(value_tables[field].setdefault(value, len(value_tables[field])))
+            # 필터 키는 CatalogSnapshot 과 같게 정규화
+            key = (value or '').strip()
+            filter_keys[field].append(key)
+            index_positions[field].setdefault(key, []).append(position)
+
+    count = len(ids)
+    order = range(count)
+    sections = [
+        ('id', ids.tobytes()),
+        ('price', prices.tobytes()),
+    ]
+
+    # id 조회용: 같은 id 가 여러 번 나오면 dict 처럼 마지막 것이 이긴다 (bisect_right - 1)
+    by_id = sorted(order, key=ids.__getitem__)
+    sections.append(('id_sorted', array('q', (ids[i] for i in by_id)).tobytes()))
+    sections.append(('id_pos', array('I', by_id).tobytes()))
+    price_asc = array('I', sorted(order, key=prices.__getitem__))
+    price_values = array('q', (prices[i] for i in price_asc))
+    sections.append(('price_asc', price_asc.tobytes()))
+    sections.append(('price_desc', array('I', sorted(order, key=prices.__getitem__, reverse=True)).tobytes()))
+    sections.append(('price_values', price_values.tobytes()))
+
+    edges = price_edges(price_values)
+    histograms = price_histograms(prices, filter_keys['style'], filter_keys['brand'], edges)
+    sections.append(('price_edges', json.dumps(edges).encode('utf-8')))
+    sections.append(('price_histograms', json.dumps(
+        [[style, brand, counts] for (style, brand), counts in histograms.items()],
+        ensure_ascii=False).encode('utf-8')))
+
+    for field in CODED_FIELDS:
+        values = sorted(value_tables[field], key=value_tables[field].get)
+        keys = list(index_positions[field])
+        sections.append((f'{field}_code', codes[field].tobytes()))
+        sections.append((f'{field}_values', json.dumps(values, ensure_ascii=False).encode('utf-8')))
+        sections.append((f'{field}_index', json.dumps(keys, ensure_ascii=False).encode('utf-8')))
+        sections.append((f'{field}_bits', b''.join(_bitmap(index_positions[field][k], count) for k in keys)))
+
+    for field in BLOB_FIELDS:
+        offsets, blob = _blob(columns[field])
+        sections.append((f'{field}_off', offsets.tobytes()))
+        sections.append((field, blob))
+    sections.append(('name_lower', '\0'.join(lower_name(v) for v in columns['name']).encode('utf-8')))
+
+    # 섹션 위치 계산 (8바이트 정렬) 후 임시 파일에 쓰고 교체 (읽는 중인 워커는 이전 파일을 계속 본다)
+    position = HEADER.size + SECTION.size * len(sections)
+    directory = []
+    for name, data in sections:
+        position += -position % 8
+        directory.append((name, position, len(data)))
+        position += len(data)
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count, st.st_mtime_ns, st.st_size, len(sections)))
+        for name, offset, length in directory:
+            f.write(SECTION.pack(name.encode('ascii'), offset, length))
+        for (name, data), (_, offset, _) in zip(sections, directory):
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, out_path)
+    return count
+
+
+# ---------- 읽기 ----------
+class ColumnarTable:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+
+        magic, version, count, mtime_ns, size, nsections = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f'{path}: 지원하지 않는 카탈로그 파일입니다')
+        self.count = count
+        self.source_signature = (mtime_ns, size)
+
+        self._sections = {}
+        for i in range(nsections):
+            name, offset, length = SECTION.unpack_from(view, HEADER.size + SECTION.size * i)
+            self._sections[name.rstrip(b'\0').decode('ascii')] = view[offset:offset + length]
+
+        self.ids = self.section('id', 'q')
+        self.prices = self.section('price', 'q')
+        self.id_sorted = self.section('id_sorted', 'q')
+        self.id_pos = self.section('id_pos', 'I')
+        self.price_asc = self.section('price_asc', 'I')
+        self.price_desc = self.section('price_desc', 'I')
+        self.price_values = self.section('price_values', 'q')
+        self.codes = {field: self.section(f'{field}_code', 'I') for field in CODED_FIELDS}
+        self.values = {field: json.loads(bytes(self.section(f'{field}_values'))) for field in CODED_FIELDS}
+        self.offsets = {field: self.section(f'{field}_off', 'Q') for field in BLOB_FIELDS}
+        self.blobs = {field: self.section(field) for field in BLOB_FIELDS}
+
+    def section(self, name, fmt=None):
+        view = self._sections[name]
+        return view.cast(fmt) if fmt else view
+
+    def value(self, field, position):
+        if field == 'id':
+            return self.ids[position]
+        if field == 'price':
+            return self.prices[position]
+        if field in CODED_FIELDS:
+            code = self.codes[field][position]
+            return None if code == NO_VALUE else self.values[field][code]
+        offsets = self.offsets[field]
+        return str(self.blobs[field][offsets[position]:offsets[position + 1]], 'utf-8')
+
+    def bitsets(self, field):
+        # 필터 키별 비트셋 (CatalogSnapshot.style_bits / brand_bits 와 같은 형태)
+        keys = json.loads(bytes(self.section(f'{field}_index')))
+        bits = self.section(f'{field}_bits')
+        nbytes = (self.count + 7) // 8
+        return {key: int.from_bytes(bits[i * nbytes:(i + 1) * nbytes], 'little') for i, key in enumerate(keys)}
+
+    def price_histograms(self):
+        edges = json.loads(bytes(self.section('price_edges')))
+        rows = json.loads(bytes(self.section('price_histograms')))
+        return edges, {(style, brand): counts for style, brand, counts in rows}
+
+    def lower_names(self):
+        if not self.count:
+            return []
+        return str(self.section('name_lower'), 'utf-8').split('\0')
+
+
+class ProductRow(Mapping):
+    """상품 한 건의 지연 조회 뷰. dict 처럼 product['name'], product.get('name') 로 쓰고,
+    템플릿에서는 product.name 으로 쓴다. 값은 접근할 때 mmap 에서 읽는다."""
+    __slots__ = ('_table', '_position')
+
+    def __init__(self, table, position):
+        self._table = table
+        self._position = position
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return self._table.value(key, self._position)
+
+    def __getattr__(self, key):
+        if key in FIELDS:
+            return self._table.value(key, self._position)
+        raise AttributeError(key)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f'<ProductRow id={self["id"]}>'
+
+
+class ColumnarProducts:
+    """CatalogSnapshot.products 로 쓰이는 시퀀스 (products[i] → ProductRow)"""
+
+    def __init__(self, table):
+        self._table = table
+
+    def __len__(self):
+        return self._table.count
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [ProductRow(self._table, i) for i in range(*position.indices(self._table.count))]
+        if position < 0:
+            position += self._table.count
+        if not 0 <= position < self._table.count:
+            raise IndexError(position)
+        return ProductRow(self._table, position)
+
+    def __iter__(self):
+        for position in range(self._table.count):
+            yield ProductRow(self._table, position)
+
+
+class ColumnarIdIndex:
+    """CatalogSnapshot.by_id 로 쓰이는 id 조회 (정렬된 id 배열 이진 탐색)"""
+
+    def __init__(self, table):
+        self._table = table
+
+    def get(self, product_id, default=None):
+        if not isinstance(product_id, int):
+            return default
+        id_sorted = self._table.id_sorted
+        i = bisect.bisect_right(id_sorted, product_id) - 1
+        if i < 0 or id_sorted[i] != product_id:
+            return default
+        return ProductRow(self._table, self._table.id_pos[i])
+
+    def __contains__(self, product_id):
+        return self.get(product_id) is not None
+
+
+def load_indexes(table):
+    """CatalogSnapshot 에 넘길 인덱스 (파일에 미리 계산된 값을 그대로 쓴다)"""
+    style_bits = table.bitsets('style')
+    edges, histograms = table.price_histograms()
+    brand_bits = table.bitsets('brand')
+    return {
+        'by_id': ColumnarIdIndex(table),
+        'style_bits': style_bits,
+        'brand_bits': brand_bits,
+        'style_counts': {k: v.bit_count() for k, v in style_bits.items()},
+        'brand_counts': {k: v.bit_count() for k, v in brand_bits.items()},
+        'price_asc': table.price_asc,
+        'price_desc': table.price_desc,
+        'price_values': table.price_values,
+        'price_edges': edges,
+        'price_histograms': histograms,
+        'names': table.lower_names,
+    }
+
+
+# ---------- CLI ----------
+@click.command('compile-catalog')
+def compile_catalog_command():
+    """products.json 을 mmap 으로 읽는 컬럼형 카탈로그 파일로 변환한다."""
+    import time
+
+    json_path = current_app.config['PRODUCTS_JSON_PATH']
+    out_path = current_app.config['CATALOG_COLUMNAR_PATH']
+    started = time.perf_counter()
+    count = compile_catalog(json_path, out_path)
+    click.echo(f'{out_path}: 상품 {count}개, {os.path.getsize(out_path) // 1024}KB, '
+               f'{time.perf_counter() - started:.2f}초')
@@ -0,0 +1,113 @@
+import gzip
+import threading
+import time
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# ========== 응답 압축 (HTML / JSON) ==========
+# Accept-Encoding 을 보고 일정 크기 이상의 텍스트 응답을 br(설치된 경우) 또는 gzip 으로 압축한다.
+# 파일 전송(send_file), 스트리밍 응답, 이미 인코딩된 응답(/assets/ 의 .gz 등)은 건드리지 않는다.
+# 압축하면 본문 바이트가 달라지므로 ETag 는 약한 ETag(W/"...") 로 바꾼다.
+# 같은 요청의 200 과 304 가 같은 ETag 를 보내도록, 압축을 협상한 요청이면 본문 크기와 상관없이 약한 ETag 로 통일하고
+# 304 에도 같은 규칙을 적용한다.
+
+class ResponseCompressor:
+    def __init__(self):
+        self.min_size = 1024
+        self.level = 6
+        self.brotli_quality = 4
+        self.mimetypes = set()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.responses = 0
+            self.bytes_in = 0
+            self.bytes_out = 0
+            self.seconds = 0.0
+
+    def init_app(self, app):
+        self.min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+        self.level = app.config.get('COMPRESSION_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+        self.mimetypes = set(app.config.get('COMPRESSION_MIMETYPES', ('text/html', 'application/json')))
+        app.extensions['compression'] = self
+        app.after_request(self.compress_response)
+
+    def _choose_encoding(self):
+        accept = request.accept_encodings
+        if brotli is not None and accept['br'] > 0:
+            return 'br'
+        if accept['gzip'] > 0:
+            return 'gzip'
+        return None
+
+    @staticmethod
+    def _weaken_etag(response):
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+    def compress_response(self, response):
+        # http_cache.not_modified 의 304 는 기본 mimetype(text/html) 이라 여기까지 오고,
+        # send_file 이 만든 /assets/ 의 304 는 원래 mimetype 이라 건너뛴다 (그 200 도 강한 ETag 그대로)
+        if response.mimetype not in self.mimetypes:
+            return response
+        # 같은 URL 이라도 Accept-Encoding 에 따라 본문이 달라질 수 있음을 캐시에 알린다
+        response.vary.add('Accept-Encoding')
+
+        encoding = self._choose_encoding()
+        if encoding is not None:
+            self._weaken_etag(response)
+
+        if (response.status_code < 200 or response.status_code in (204, 206)
+                or response.direct_passthrough or response.is_streamed
+                or 'Content-Encoding' in response.headers
+                or 'no-transform' in (response.headers.get('Cache-Control') or '')
+                or encoding is None):
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        started = time.perf_counter()
+        if encoding == 'br':
+            compressed = brotli.compress(data, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(data, compresslevel=self.level)
+        elapsed = time.perf_counter() - started
+
+        response.set_data(compressed)
+        response.headers['Content-Encoding'] = encoding
+
+        with self._lock:
+            self.responses += 1
+            self.bytes_in += len(data)
+            self.bytes_out += len(compressed)
+            self.seconds += elapsed
+        return response
+
+    def stats(self):
+        return {
+            'responses': self.responses,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'ratio': round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+            'cpu_ms_mean': round(self.seconds * 1000 / self.responses, 3) if self.responses else 0.0,
+        }
+
+
+compressor = ResponseCompressor()
+
+
+def init_compression(app):
+    if app.config.get('COMPRESSION_ENABLED', True):
+        compressor.init_app(app)
@@ -0,0 +1,68 @@
+import re
+
+import click
+from sqlalchemy import event
+
+from sprout import db
+
+
+# ========== SQLite 프로필 적용 ==========
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+PRAGMA_VALUE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _pragma_statements(pragmas):
+    statements = []
+    for name, value in pragmas.items():
+        if not PRAGMA_NAME.match(name) or not PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f'잘못된 PRAGMA 설정: {name}={value}')
+        statements.append(f'PRAGMA {name}={value}')
+    return statements
+
+
+def init_database_profile(app):
+    app.cli.add_command(check_db_command)
+
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    statements = _pragma_statements(pragmas)
+
+    with app.app_context():
+        engine = db.engine
+    if engine.dialect.name != 'sqlite' or not statements:
+        return
+
+    # 풀에서 새 연결이 만들어질 때마다 PRAGMA 를 적용한다
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+# ========== 설정 확인 명령 (flask check-db) ==========
+CHECK_PRAGMAS = ('journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'busy_timeout', 'temp_store')
+# 숫자로 돌려주는 PRAGMA 의 이름 표기
+PRAGMA_LABELS = {
+    'synchronous': {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'},
+    'temp_store': {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'},
+}
+
+
+@click.command('check-db')
+def check_db_command():
+    """현재 연결에 실제로 적용된 PRAGMA 와 커넥션 풀 설정을 출력한다."""
+    from flask import current_app
+
+    engine = db.engine
+    click.echo(f"프로필: {current_app.config.get('PROFILE')}")
+    click.echo(f"DB: {engine.url.render_as_string(hide_password=True)}")
+    click.echo(f"풀: {engine.pool.status()}")
+
+    with engine.connect() as conn:
+        for name in CHECK_PRAGMAS:
+            value = conn.exec_driver_sql(f'PRAGMA {name}').scalar()
+            value = PRAGMA_LABELS.get(name, {}).get(value, value)
+            expected = current_app.config.get('SQLITE_PRAGMAS', {}).get(name)
+            mark = '' if expected is None or str(expected).lower() == str(value).lower() else f'  (설정값: {expected})'
+            click.echo(f"  {name:14s} = {value}{mark}")
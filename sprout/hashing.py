@@ -0,0 +1,66 @@
+import os
+import threading
+from contextlib import contextmanager
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """해시 작업 슬롯을 제한 시간 안에 얻지 못했을 때 발생한다."""
+
+
+# ========== 비밀번호 해시 서비스 ==========
+# - 동시에 실행되는 해시 작업 수를 제한하고, 슬롯이 없으면 제한 시간까지만 기다린다
+#   (로그인이 몰려도 해시 계산이 다른 요청의 CPU 를 모두 차지하지 않도록)
+# - 해시 방식/비용은 설정으로 바꿀 수 있고, 로그인 시 예전 방식의 해시는 새 방식으로 다시 저장한다
+# - 존재하지 않는 사용자도 같은 슬롯을 기다린 뒤 더미 해시로 검증해서, 응답 시간으로 사용자 존재 여부가 드러나지 않게 한다
+class PasswordHasher:
+    def __init__(self):
+        self.method = 'scrypt:32768:8:1'
+        self.timeout = 5.0
+        self._slots = threading.BoundedSemaphore(os.cpu_count() or 1)
+        self._dummy_hash = None
+        self._method_prefix = self.method
+
+    def init_app(self, app):
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        # 현재 해시 설정으로 만든 더미 해시. 첫 로그인 요청이 만드는 비용을 내지 않도록 여기서 미리 만든다
+        # (preload_app 이면 마스터에서 한 번 만들어 워커들이 물려받는다)
+        self._dummy_hash = generate_password_hash(os.urandom(16).hex(), method=self.method)
+        # 'scrypt', 'pbkdf2:sha256' 처럼 비용을 생략한 설정도 저장될 때는 기본 비용이 붙는다
+        # ('scrypt:32768:8:1') → 실제로 만든 해시의 방식 부분과 비교한다
+        self._method_prefix = self._dummy_hash.split('$', 1)[0]
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        self._slots = threading.BoundedSemaphore(
+            app.config.get('PASSWORD_HASH_MAX_CONCURRENCY') or os.cpu_count() or 1
+        )
+        app.extensions['password_hasher'] = self
+
+    @contextmanager
+    def _slot(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise HashingBusy()
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def hash(self, password):
+        with self._slot():
+            return generate_password_hash(password, method=self.method)
+
+    def verify(self, stored_hash, password):
+        with self._slot():
+            return check_password_hash(stored_hash, password)
+
+    def verify_unknown(self, password):
+        # 실제 검증과 같은 슬롯 대기 + 같은 비용의 해시 계산을 거친다 (결과는 항상 실패)
+        self.verify(self._dummy_hash, password)
+        return False
+
+    def needs_rehash(self, stored_hash):
+        # werkzeug 해시 형식: "{method}${salt}${hash}"
+        return stored_hash.split('$', 1)[0] != self._method_prefix
+
+
+password_hasher = PasswordHasher()
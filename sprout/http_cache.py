@@ -0,0 +1,65 @@
+import hashlib
+import os
+
+from flask import current_app, g, make_response, request
+
+
+# ========== ETag 조건부 GET ==========
+# 본문을 만들기 전에 ETag 를 계산해서 If-None-Match 가 일치하면 렌더링/DB 조회 없이 304 를 돌려준다.
+
+def _template_version(app):
+    # 배포로 템플릿이 바뀌면 ETag 도 바뀌도록 템플릿 파일들의 (mtime, size) 를 한 번만 계산해 둔다
+    version = app.extensions.get('template_version')
+    if version is None:
+        digest = hashlib.sha1()
+        for root, _, files in os.walk(os.path.join(app.root_path, app.template_folder)):
+            for name in sorted(files):
+                st = os.stat(os.path.join(root, name))
+                digest.update(f'{name}:{st.st_mtime_ns}:{st.st_size};'.encode())
+        version = digest.hexdigest()[:12]
+        app.extensions['template_version'] = version
+    return version
+
+
+def _build_version():
+    # 페이지에 들어가는 지문(해시) 파일 이름이 바뀌면 ETag 도 바뀌어야 한다.
+    # 템플릿이 그대로여도 build-assets / build-images 가 이전 파일을 지우므로, 예전 HTML 을 304 로 재사용하면 안 된다
+    from sprout.assets import asset_manifest
+    from sprout.images import image_manifest
+
+    asset_manifest.refresh()
+    image_manifest.images()
+    return f'{asset_manifest.digest}:{image_manifest.digest}'
+
+
+def _viewer():
+    # 헤더에 로그인 사용자 이름이 표시되므로 페이지 ETag 에는 사용자 정보가 포함되어야 한다
+    user = g.get('user')
+    return f'{user.id}:{user.username}' if user else 'anon'
+
+
+def make_etag(*parts, per_user=True):
+    values = [_template_version(current_app), _build_version(), *parts]
+    if per_user:
+        values.append(_viewer())
+    return hashlib.sha1('|'.join(str(v) for v in values).encode('utf-8')).hexdigest()
+
+
+def is_not_modified(etag):
+    # 압축된 응답은 약한 ETag(W/"...") 로 나가므로 약한 비교를 한다 (If-None-Match 는 약한 비교가 표준)
+    return request.if_none_match.contains_weak(etag)
+
+
+def _set_validators(response, etag):
+    response.set_etag(etag)
+    # 사용자마다 다른 응답이므로 공유 캐시에는 저장하지 않고, 매번 재검증하게 한다
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified(etag):
+    return _set_validators(current_app.response_class(status=304), etag)
+
+
+def with_etag(rv, etag):
+    return _set_validators(make_response(rv), etag)
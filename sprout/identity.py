@@ -0,0 +1,66 @@
+from sqlalchemy import event
+
+from sprout import db
+from sprout.cache import LRUCache
+from sprout.models import User
+
+
+# ========== 로그인 사용자 스냅샷 ==========
+# g.user 로 쓰이는 가벼운 읽기 전용 객체 (템플릿/뷰에서 쓰는 필드만 담는다)
+class UserIdentity:
+    __slots__ = ('id', 'username', 'email', 'phone')
+
+    def __init__(self, id, username, email, phone):
+        self.id = id
+        self.username = username
+        self.email = email
+        self.phone = phone
+
+    def __repr__(self):
+        return f'<UserIdentity {self.username}>'
+
+
+# ========== 프로세스별 사용자 캐시 ==========
+identity_cache = LRUCache()
+
+
+def configure_identity_cache(app):
+    identity_cache.configure(
+        app.config.get('IDENTITY_CACHE_SIZE', 1024),
+        app.config.get('IDENTITY_CACHE_TTL', 60),
+    )
+
+
+def load_identity(user_id):
+    identity = identity_cache.get(user_id)
+    if identity is not None:
+        return identity
+
+    row = db.session.execute(
+        db.select(User.id, User.username, User.email, User.phone).where(User.id == user_id)
+    ).first()
+    if row is None:
+        return None
+
+    identity = UserIdentity(*row)
+    identity_cache.set(user_id, identity)
+    return identity
+
+
+def invalidate_identity(user_id):
+    identity_cache.pop(user_id)
+
+
+# 회원 정보가 ORM 으로 수정/삭제되면 캐시에서 제거한다
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_on_change(mapper, connection, target):
+    invalidate_identity(target.id)
+
+
+def identity_stats():
+    stats = identity_cache.stats()
+    # 이전에는 요청마다 before_request 훅 두 개가 각각 User 를 조회했다 (요청당 2회)
+    requests = stats['hits'] + stats['misses']
+    stats['queries_saved'] = requests * 2 - stats['misses']
+    return stats
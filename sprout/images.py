@@ -0,0 +1,260 @@
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+from sprout.assets import manifest_digest
+
+
+# ========== 반응형 이미지 파생본 ==========
+# static/image 의 원본(JPG/PNG/JFIF)을 폭 단계별 WebP/JPEG 로 줄여 static/image/derived 에 저장하고,
+# 원본 경로 → 파생본 목록을 manifest.json 에 기록한다. 파일 이름에 내용 해시를 넣으므로 오래 캐시해도 된다.
+#   flask build-images            # 바뀐 원본만 다시 만든다
+#   flask build-images --force    # 전부 다시 만든다
+# 템플릿에서는 {{ responsive_image('image/gagu1.jpg', alt='...', sizes='350px') }} 로 쓴다.
+# 매니페스트가 없거나 등록되지 않은 이미지는 기존처럼 원본 <img> 를 그대로 출력한다.
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.jfif', '.png')
+FORMAT_EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+MIME_TYPES = {'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+MANIFEST_NAME = 'manifest.json'
+
+
+def _require_pillow():
+    try:
+        from PIL import Image
+    except ImportError:
+        raise click.ClickException('이미지 파생본 생성에는 Pillow 가 필요합니다: pip install Pillow')
+    return Image
+
+
+def _file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ---------- 변환 (프로세스 풀에서 실행되므로 모듈 최상위 함수) ----------
+def build_derivatives(source_path, stem, output_dir, widths, formats, quality):
+    Image = _require_pillow()
+
+    with Image.open(source_path) as image:
+        image.load()
+        width, height = image.size
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        # 원본보다 큰 단계는 만들지 않고, 원본 폭은 항상 포함한다
+        steps = sorted({w for w in widths if w < width} | {width})
+        variants = {fmt: [] for fmt in formats}
+        for step in steps:
+            resized = image if step == width else image.resize(
+                (step, max(round(height * step / width), 1)), Image.LANCZOS)
+            for fmt in formats:
+                frame = resized
+                if fmt == 'jpeg' and frame.mode == 'RGBA':
+                    # JPEG 는 투명도가 없으므로 흰 배경에 합성한다
+                    background = Image.new('RGB', frame.size, (255, 255, 255))
+                    background.paste(frame, mask=frame.getchannel('A'))
+                    frame = background
+
+                buffer = io.BytesIO()
+                options = {'quality': quality.get(fmt, 80)}
+                if fmt == 'jpeg':
+                    options.update(optimize=True, progressive=True)
+                else:
+                    options.update(method=4)
+                frame.save(buffer, fmt.upper(), **options)
+                data = buffer.getvalue()
+
+                filename = f'{stem}.{step}.{hashlib.sha1(data).hexdigest()[:10]}.{FORMAT_EXTENSIONS[fmt]}'
+                target = os.path.join(output_dir, filename)
+                if not os.path.exists(target):
+                    with open(target, 'wb') as f:
+                        f.write(data)
+                variants[fmt].append([step, filename, len(data)])
+
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+# ---------- 빌드 ----------
+def _settings(app):
+    return {
+        'widths': sorted(app.config.get('IMAGE_WIDTHS', (320, 640, 960, 1280, 1920))),
+        'formats': list(app.config.get('IMAGE_FORMATS', ('webp', 'jpeg'))),
+        'quality': dict(app.config.get('IMAGE_QUALITY', {'webp': 80, 'jpeg': 82})),
+    }
+
+
+def _paths(app):
+    source_dir = os.path.join(app.static_folder, app.config.get('IMAGE_SOURCE_DIR', 'image'))
+    output_dir = os.path.join(app.static_folder, app.config.get('IMAGE_DERIVED_DIR', 'image/derived'))
+    return source_dir, output_dir
+
+
+def _read_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def build_images(app, force=False, workers=None, log=click.echo):
+    _require_pillow()
+    source_dir, output_dir = _paths(app)
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+
+    settings = _settings(app)
+    old = _read_manifest(manifest_path) or {}
+    old_images = old.get('images', {}) if old.get('settings') == settings and not force else {}
+
+    # 원본 목록 (파생본 디렉터리 자체는 제외)
+    sources = []
+    for root, dirs, files in os.walk(source_dir):
+        dirs[:] = [d for d in dirs if os.path.join(root, d) != output_dir]
+        for filename in sorted(files):
+            if filename.lower().endswith(SOURCE_EXTENSIONS):
+                path = os.path.join(root, filename)
+                # 키는 url_for('static', filename=...) 에 쓰는 경로와 같은 형태 (예: image/gagu1.jpg)
+                sources.append((os.path.relpath(path, app.static_folder).replace(os.sep, '/'), path))
+
+    images = {}
+    jobs = {}
+    for name, path in sources:
+        source_hash = _file_hash(path)
+        entry = old_images.get(name)
+        if entry and entry['source_hash'] == source_hash and all(
+                os.path.exists(os.path.join(output_dir, v[1]))
+                for variants in entry['variants'].values() for v in variants):
+            images[name] = entry
+        else:
+            jobs[name] = (path, source_hash)
+
+    started = time.perf_counter()
+    log(f'원본 {len(sources)}개 중 {len(jobs)}개 변환 ({len(sources) - len(jobs)}개는 변경 없음)')
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers or app.config.get('IMAGE_BUILD_WORKERS')) as pool:
+            futures = {}
+            for name, (path, _) in jobs.items():
+                # 파생본 이름은 원본 디렉터리 기준 경로로 만든다 (예: sub/a.jpg → sub_a.640.<hash>.webp)
+                stem = os.path.splitext(os.path.relpath(path, source_dir))[0].replace(os.sep, '_')
+                futures[name] = pool.submit(build_derivatives, path, stem, output_dir,
+                                            settings['widths'], settings['formats'], settings['quality'])
+            for name, future in futures.items():
+                entry = future.result()
+                entry['source_hash'] = jobs[name][1]
+                images[name] = entry
+                original = os.path.getsize(jobs[name][0])
+                smallest = min(v[2] for variants in entry['variants'].values() for v in variants)
+                log(f'  {name}: {original // 1024}KB → 최소 {smallest // 1024}KB '
+                    f'({sum(len(v) for v in entry["variants"].values())}개)')
+
+    manifest = {'settings': settings, 'images': dict(sorted(images.items()))}
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, manifest_path)
+
+    # 매니페스트에서 더 이상 쓰지 않는 파생본 삭제
+    keep = {v[1] for entry in images.values() for variants in entry['variants'].values() for v in variants}
+    removed = 0
+    for filename in os.listdir(output_dir):
+        if filename != MANIFEST_NAME and filename not in keep:
+            os.remove(os.path.join(output_dir, filename))
+            removed += 1
+
+    log(f'완료: {time.perf_counter() - started:.1f}초, 오래된 파생본 {removed}개 삭제')
+    return manifest
+
+
+@click.command('build-images')
+@click.option('--force', is_flag=True, help='변경 여부와 관계없이 모두 다시 만든다')
+@click.option('--workers', type=int, default=None, help='변환 프로세스 수 (기본: CPU 코어 수)')
+def build_images_command(force, workers):
+    """static/image 원본으로 폭 단계별 WebP/JPEG 파생본과 매니페스트를 만든다."""
+    build_images(current_app, force=force, workers=workers)
+
+
+# ========== 템플릿 헬퍼 ==========
+class ImageManifest:
+    def __init__(self, check_interval=1.0):
+        self.path = None
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = None
+        self._checked_at = 0.0
+        self._images = {}
+        self.digest = ''  # 페이지 ETag 에 넣는 매니페스트 해시 (파생본이 다시 만들어지면 바뀐다)
+
+    def images(self):
+        # 빌드가 다시 실행되면 재시작 없이 반영되도록 파일 변경을 주기적으로 확인한다
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._images
+        with self._lock:
+            try:
+                st = os.stat(self.path)
+                signature = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                signature = None
+            if signature != self._signature:
+                manifest = _read_manifest(self.path) if signature else None
+                self._images = manifest.get('images', {}) if manifest else {}
+                self.digest = manifest_digest(self._images)
+                self._signature = signature
+            self._checked_at = now
+        return self._images
+
+
+image_manifest = ImageManifest()
+
+
+def _attributes(attrs):
+    return ''.join(f' {escape(key.rstrip("_"))}="{escape(value)}"' for key, value in attrs.items() if value is not None)
+
+
+def responsive_image(filename, alt='', sizes='100vw', **attrs):
+    entry = image_manifest.images().get(filename)
+    if entry is None:
+        return Markup(f'<img src="{escape(url_for("static", filename=filename))}" alt="{escape(alt)}"'
+                      f'{_attributes(attrs)}>')
+
+    derived_dir = current_app.config.get('IMAGE_DERIVED_DIR', 'image/derived')
+
+    def srcset(fmt):
+        return ', '.join(f'{url_for("static", filename=f"{derived_dir}/{name}")} {width}w'
+                         for width, name, _ in entry['variants'][fmt])
+
+    # 원래 크기를 width/height 로 넣어 두면 srcset 을 써도 레이아웃이 바뀌지 않는다
+    attrs.setdefault('width', entry['width'])
+    attrs.setdefault('height', entry['height'])
+
+    formats = list(entry['variants'])
+    fallback = 'jpeg' if 'jpeg' in formats else formats[-1]
+    sources = ''.join(f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(srcset(fmt))}" sizes="{escape(sizes)}">'
+                      for fmt in formats if fmt != fallback)
+    largest = entry['variants'][fallback][-1][1]
+    return Markup(
+        f'<picture class="responsive-image">{sources}'
+        f'<img src="{escape(url_for("static", filename=f"{derived_dir}/{largest}"))}" '
+        f'srcset="{escape(srcset(fallback))}" sizes="{escape(sizes)}" alt="{escape(alt)}"{_attributes(attrs)}>'
+        f'</picture>'
+    )
+
+
+def init_images(app):
+    app.cli.add_command(build_images_command)
+    _, output_dir = _paths(app)
+    image_manifest.path = os.path.join(output_dir, MANIFEST_NAME)
+    app.jinja_env.globals['responsive_image'] = responsive_image
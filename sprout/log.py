@@ -0,0 +1,114 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+import uuid
+
+from flask import g, has_request_context, request
+
+
+# ========== 구조화(JSON) 로그 포맷 ==========
+class JsonFormatter(logging.Formatter):
+    # LogRecord 기본 속성 이외의 값(extra=...)은 그대로 필드로 내보낸다
+    RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'request_id'}
+
+    def format(self, record):
+        data = {
+            'ts': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(record.created)) + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'request_id': getattr(record, 'request_id', '-'),
+            'msg': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self.RESERVED and not key.startswith('_'):
+                data[key] = value
+        if record.exc_info:
+            data['exc'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+# ========== 요청 ID 주입 ==========
+# 큐에 넣기 전(요청 스레드)에서 실행되어야 하므로 QueueHandler 에 붙인다
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = g.get('request_id', '-') if has_request_context() else '-'
+        return True
+
+
+# ========== 큐 기반 비동기 핸들러 ==========
+# 요청 스레드는 큐에 넣기만 하고, 실제 stdout 쓰기는 백그라운드 스레드가 담당한다.
+# 큐가 가득 차면 요청을 막지 않고 버린 뒤 개수만 센다.
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self.queue_size = 10000
+
+    def start(self):
+        q = queue.Queue(self.queue_size)
+        output = logging.StreamHandler(sys.stdout)
+        output.setFormatter(JsonFormatter())
+
+        if self.handler is None:
+            self.handler = DroppingQueueHandler(q)
+            self.handler.addFilter(RequestIdFilter())
+        else:
+            self.handler.queue = q
+        self.listener = logging.handlers.QueueListener(q, output, respect_handler_level=False)
+        self.listener.start()
+
+    def stop(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def _restart_in_child(self):
+        # fork 된 워커에는 부모의 writer 스레드가 없으므로 새 큐/스레드로 다시 시작한다
+        if self.listener is not None:
+            self.listener = None
+            self.start()
+
+
+pipeline = LogPipeline()
+
+
+def init_logging(app):
+    root = logging.getLogger('sprout')
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+    for name, level in app.config.get('LOG_LEVELS', {}).items():
+        logging.getLogger(name).setLevel(level)
+
+    if pipeline.handler is None:
+        pipeline.queue_size = app.config.get('LOG_QUEUE_SIZE', 10000)
+        pipeline.start()
+        root.addHandler(pipeline.handler)
+        root.propagate = False
+        atexit.register(pipeline.stop)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=pipeline._restart_in_child)
+
+    @app.before_request
+    def assign_request_id():
+        g.request_id = request.headers.get('X-Request-ID', '')[:64] or uuid.uuid4().hex
+
+    @app.after_request
+    def expose_request_id(response):
+        response.headers['X-Request-ID'] = g.get('request_id', '')
+        return response
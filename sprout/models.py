@@ -14,6 +14,7 @@ class User(db.Model):
     email = db.Column(db.String(120), unique=True, nullable=False)
     phone = db.Column(db.String(20), nullable=True)
     address = db.Column(db.String(300), nullable=True)  # 배송지
+    cart_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')  # 장바구니 변경 시 증가
     created_date = db.Column(db.DateTime, nullable=False, default=datetime.now)
 
     # 관계: user.cart_items로 장바구니 조회 가능
@@ -28,6 +29,12 @@ class User(db.Model):
 # ===============================
 class Product(db.Model):
     __tablename__ = 'product'
+    # /sub 의 스타일/브랜드 필터 + 가격 정렬용 복합 인덱스, 가격 범위 필터용 인덱스
+    __table_args__ = (
+        db.Index('ix_product_style_price', 'style', 'price'),
+        db.Index('ix_product_brand_price', 'brand', 'price'),
+        db.Index('ix_product_price', 'price'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     brand = db.Column(db.String(100))
@@ -47,6 +54,14 @@ class Product(db.Model):
 # ===============================
 class CartItem(db.Model):
     __tablename__ = 'cart_item'
+    # 같은 사용자가 같은 상품을 두 번 담을 수 없도록 (충돌 무시 insert 의 기준)
+    __table_args__ = (
+        db.Index('ux_cart_item_user_product', 'user_id', 'product_id', unique=True),
+        # 마이페이지 최신순 페이지네이션용
+        db.Index('ix_cart_item_user_created', 'user_id', 'created_date'),
+        # 상품 정보가 바뀌었을 때 해당 상품이 담긴 행만 찾아 스냅샷을 갱신하기 위함
+        db.Index('ix_cart_item_product', 'product_id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
@@ -0,0 +1,214 @@
+import heapq
+import logging
+import threading
+import time
+
+from flask import before_render_template, g, has_request_context, jsonify, request, template_rendered
+from sqlalchemy import event
+
+from sprout import db
+
+logger = logging.getLogger(__name__)
+
+
+# ========== 요청 단위 프로파일링 ==========
+# PROFILING_ENABLED 일 때만 훅/이벤트를 등록하므로, 꺼져 있으면 요청 처리 경로에 추가 비용이 없다.
+#   - DB: SQLAlchemy 엔진 이벤트로 쿼리 수/시간을 요청별로 합산
+#   - 템플릿: render_template 신호로 렌더링 시간 합산 (템플릿 안에서 나간 쿼리 시간도 포함된다)
+#   - 응답에 Server-Timing 헤더 추가, /__metrics 에서 엔드포인트별 집계 확인
+
+# 지연시간 히스토그램 구간 (ms, 이하)
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class RequestProfile:
+    __slots__ = ('started', 'queries', 'db_seconds', 'render_seconds', 'render_depth', 'render_started')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.render_seconds = 0.0
+        self.render_depth = 0
+        self.render_started = 0.0
+
+
+class EndpointStats:
+    __slots__ = ('count', 'total_ms', 'max_ms', 'buckets', 'queries', 'max_queries', 'db_ms', 'render_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.queries = 0
+        self.max_queries = 0
+        self.db_ms = 0.0
+        self.render_ms = 0.0
+
+    def add(self, total_ms, profile):
+        self.count += 1
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if total_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.queries += profile.queries
+        self.max_queries = max(self.max_queries, profile.queries)
+        self.db_ms += profile.db_seconds * 1000
+        self.render_ms += profile.render_seconds * 1000
+
+    def to_dict(self):
+        bounds = list(BUCKETS_MS) + [None]
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3),
+            'max_ms': round(self.max_ms, 3),
+            'histogram': [{'le_ms': bound, 'count': n} for bound, n in zip(bounds, self.buckets)],
+            'queries_mean': round(self.queries / self.count, 2),
+            'queries_max': self.max_queries,
+            'db_ms_mean': round(self.db_ms / self.count, 3),
+            'render_ms_mean': round(self.render_ms / self.count, 3),
+        }
+
+
+class ProfilingMetrics:
+    def __init__(self, slow_query_count=20):
+        self.slow_query_count = slow_query_count
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+            # (소요 ms, 순번, endpoint, SQL) 의 min-heap 으로 가장 느린 쿼리 N 개만 유지
+            self.slow_queries = []
+            self._seq = 0
+
+    def record_request(self, endpoint, total_ms, profile):
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointStats()
+            stats.add(total_ms, profile)
+
+    def record_query(self, endpoint, duration_ms, statement):
+        with self._lock:
+            if len(self.slow_queries) >= self.slow_query_count and duration_ms <= self.slow_queries[0][0]:
+                return
+            self._seq += 1
+            entry = (duration_ms, self._seq, endpoint, statement[:500])
+            if len(self.slow_queries) < self.slow_query_count:
+                heapq.heappush(self.slow_queries, entry)
+            else:
+                heapq.heapreplace(self.slow_queries, entry)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'endpoints': {name: stats.to_dict() for name, stats in sorted(self.endpoints.items())},
+                'slowest_queries': [
+                    {'ms': round(ms, 3), 'endpoint': endpoint, 'statement': statement}
+                    for ms, _, endpoint, statement in sorted(self.slow_queries, reverse=True)
+                ],
+            }
+
+
+metrics = ProfilingMetrics()
+
+
+def _current_profile():
+    return g.get('_profile') if has_request_context() else None
+
+
+def init_profiling(app):
+    if not app.config.get('PROFILING_ENABLED'):
+        return
+
+    metrics.slow_query_count = app.config.get('PROFILING_SLOW_QUERIES', 20)
+    slow_query_ms = app.config.get('PROFILING_SLOW_QUERY_MS')
+    app.extensions['profiling'] = metrics
+
+    with app.app_context():
+        engine = db.engine
+
+    # ---------- DB ----------
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info['_query_started'].pop()
+        profile = _current_profile()
+        if profile is None:
+            return
+        profile.queries += 1
+        profile.db_seconds += duration
+
+        duration_ms = duration * 1000
+        metrics.record_query(request.endpoint, duration_ms, statement)
+        if slow_query_ms is not None and duration_ms >= slow_query_ms:
+            logger.warning('느린 쿼리 %.1fms (%s): %s', duration_ms, request.endpoint, statement[:500])
+
+    @event.listens_for(engine, 'handle_error')
+    def on_error(context):
+        # 실패한 쿼리는 after_cursor_execute 가 호출되지 않으므로 시작 시각을 여기서 버린다
+        if context.connection is not None and context.connection.info.get('_query_started'):
+            context.connection.info['_query_started'].pop()
+
+    # ---------- 템플릿 ----------
+    # 템플릿 안에서 다른 템플릿을 렌더링할 수 있으므로 가장 바깥 렌더링 시간만 합산한다
+    def on_before_render(sender, template, context, **extra):
+        profile = _current_profile()
+        if profile is not None:
+            if profile.render_depth == 0:
+                profile.render_started = time.perf_counter()
+            profile.render_depth += 1
+
+    def on_rendered(sender, template, context, **extra):
+        profile = _current_profile()
+        if profile is not None and profile.render_depth:
+            profile.render_depth -= 1
+            if profile.render_depth == 0:
+                profile.render_seconds += time.perf_counter() - profile.render_started
+
+    # 지역 함수이므로 약한 참조로 연결하면 바로 사라진다
+    before_render_template.connect(on_before_render, app, weak=False)
+    template_rendered.connect(on_rendered, app, weak=False)
+
+    # ---------- 요청 ----------
+    @app.before_request
+    def start_profile():
+        g._profile = RequestProfile()
+
+    @app.after_request
+    def finish_profile(response):
+        profile = g.pop('_profile', None)
+        if profile is None:
+            return response
+
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        db_ms = profile.db_seconds * 1000
+        render_ms = profile.render_seconds * 1000
+        response.headers['Server-Timing'] = (
+            f'db;dur={db_ms:.2f};desc="{profile.queries} queries", '
+            f'tpl;dur={render_ms:.2f}, '
+            f'app;dur={max(total_ms - db_ms - render_ms, 0):.2f}, '
+            f'total;dur={total_ms:.2f}'
+        )
+        if request.endpoint != 'profiling_metrics':
+            metrics.record_request(request.endpoint or '<unmatched>', total_ms, profile)
+        return response
+
+    # ---------- 집계 확인 (/__metrics, ?reset=1 이면 조회 후 초기화) ----------
+    def profiling_metrics():
+        data = metrics.to_dict()
+        if request.args.get('reset'):
+            metrics.reset()
+        return jsonify(data)
+
+    app.add_url_rule('/__metrics', 'profiling_metrics', profiling_metrics)
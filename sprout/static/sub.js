@@ -19,18 +19,17 @@ document.addEventListener('DOMContentLoaded', function () {
     }
   });
 
-  // 페이지 로드 시 장바구니 상태 동기화
-  fetch('/cart/check')
+  // 페이지 로드 시 장바구니 상태 동기화 (화면에 보이는 상품만 확인)
+  const visibleIds = Array.from(document.querySelectorAll('button[data-product-id]'),
+                                btn => btn.dataset.productId);
+  fetch('/cart/check?ids=' + encodeURIComponent(visibleIds.join(',')))
     .then(response => response.json())
     .then(data => {
       if (data && data.cart_items && Array.isArray(data.cart_items)) {
         data.cart_items.forEach(productId => {
           const heartBtn = document.querySelector(`button[data-product-id="${productId}"]`);
           if (heartBtn) {
-            const heartIcon = heartBtn.querySelector('i');
-            heartIcon.classList.remove('bi-heart');
-            heartIcon.classList.add('bi-heart-fill');
-            heartIcon.style.color = '#dc3545';
+            setHeart(heartBtn.querySelector('i'), true);
           }
         });
       }
@@ -40,7 +39,95 @@ document.addEventListener('DOMContentLoaded', function () {
     });
 });
 
-// 장바구니 토글 함수
+// 하트 아이콘 상태 변경
+function setHeart(heartIcon, filled) {
+    if (filled) {
+        heartIcon.classList.remove('bi-heart');
+        heartIcon.classList.add('bi-heart-fill');
+        heartIcon.style.color = '#dc3545';
+    } else {
+        heartIcon.classList.remove('bi-heart-fill');
+        heartIcon.classList.add('bi-heart');
+        heartIcon.style.color = '#333';
+    }
+}
+
+function showCartToast(message) {
+    const toast = document.createElement('div');
+    toast.className = 'position-fixed bottom-0 end-0 p-3';
+    toast.style.zIndex = '9999';
+    toast.innerHTML = `
+        <div class="toast show" role="alert">
+            <div class="toast-body bg-dark text-white rounded">
+                ${message}
+            </div>
+        </div>
+    `;
+    document.body.appendChild(toast);
+    setTimeout(() => toast.remove(), 2000);
+}
+
+function redirectToLogin() {
+    alert('로그인이 필요합니다.');
+    window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
+}
+
+// 연속 클릭은 모아서 /cart/batch 한 번으로 보낸다
+const CART_BATCH_DELAY = 400;
+const pendingCartOps = new Map();   // productId -> { action, heartIcon, wasFilled }
+let cartBatchTimer = null;
+
+function flushCartOps() {
+    cartBatchTimer = null;
+    if (pendingCartOps.size === 0) return;
+
+    const entries = Array.from(pendingCartOps.entries());
+    pendingCartOps.clear();
+
+    // 원래 상태로 되돌아간 상품은 보낼 필요가 없다
+    const changed = entries.filter(([, op]) => (op.action === 'add') !== op.wasFilled);
+    if (changed.length === 0) return;
+
+    const revert = () => changed.forEach(([, op]) => setHeart(op.heartIcon, op.wasFilled));
+
+    fetch('/cart/batch', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+            ops: changed.map(([productId, op]) => ({ action: op.action, product_id: productId }))
+        })
+    })
+    .then(response => {
+        if (response.status === 401) {
+            revert();
+            redirectToLogin();
+            return null;
+        }
+        return response.json();
+    })
+    .then(data => {
+        if (data && data.success) {
+            if (data.added > 0) {
+                showCartToast('장바구니에 추가되었습니다!');
+            }
+        } else if (data && data.redirect) {
+            revert();
+            redirectToLogin();
+        } else if (data) {
+            revert();
+            alert('장바구니 변경에 실패했습니다.');
+        }
+    })
+    .catch(error => {
+        console.error('오류:', error);
+        revert();
+        alert('오류가 발생했습니다.');
+    });
+}
+
+// 장바구니 토글 함수 (화면은 즉시 바꾸고, 서버 요청은 잠시 모았다가 보낸다)
 function toggleWishlist(event, productId) {
     event.preventDefault();
     event.stopPropagation();
@@ -49,89 +136,30 @@ function toggleWishlist(event, productId) {
     const heartIcon = button.querySelector('i');
     const isFilled = heartIcon.classList.contains('bi-heart-fill');
 
-    if (isFilled) {
-        // 장바구니에서 제거
-        fetch('/cart/remove', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ product_id: productId })
-        })
-        .then(response => {
-            if (response.status === 401) {
-                alert('로그인이 필요합니다.');
-                window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
-                return null;
-            }
-            return response.json();
-        })
-        .then(data => {
-            if (data && data.success) {
-                heartIcon.classList.remove('bi-heart-fill');
-                heartIcon.classList.add('bi-heart');
-                heartIcon.style.color = '#333';
-            } else if (data && data.redirect) {
-                alert('로그인이 필요합니다.');
-                window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
-            } else if (data) {
-                alert('삭제에 실패했습니다.');
-            }
-        })
-        .catch(error => {
-            console.error('오류:', error);
-            alert('오류가 발생했습니다.');
-        });
-    } else {
-        // 장바구니에 추가
-        fetch('/cart/add', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({ product_id: productId })
-        })
-        .then(response => {
-            if (response.status === 401) {
-                alert('로그인이 필요합니다.');
-                window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
-                return null;
-            }
-            return response.json();
-        })
-        .then(data => {
-            if (data && data.success) {
-                heartIcon.classList.remove('bi-heart');
-                heartIcon.classList.add('bi-heart-fill');
-                heartIcon.style.color = '#dc3545';
-
-                // 알림 메시지
-                const toast = document.createElement('div');
-                toast.className = 'position-fixed bottom-0 end-0 p-3';
-                toast.style.zIndex = '9999';
-                toast.innerHTML = `
-                    <div class="toast show" role="alert">
-                        <div class="toast-body bg-dark text-white rounded">
-                            장바구니에 추가되었습니다!
-                        </div>
-                    </div>
-                `;
-                document.body.appendChild(toast);
-                setTimeout(() => toast.remove(), 2000);
-            } else if (data && data.redirect) {
-                alert('로그인이 필요합니다.');
-                window.location.href = '/login/?next=' + encodeURIComponent(window.location.pathname);
-            } else if (data) {
-                alert('추가에 실패했습니다.');
-            }
-        })
-        .catch(error => {
-            console.error('오류:', error);
-            alert('오류가 발생했습니다.');
-        });
-    }
+    const pending = pendingCartOps.get(productId);
+    pendingCartOps.set(productId, {
+        action: isFilled ? 'remove' : 'add',
+        heartIcon: heartIcon,
+        wasFilled: pending ? pending.wasFilled : isFilled
+    });
+    setHeart(heartIcon, !isFilled);
+
+    clearTimeout(cartBatchTimer);
+    cartBatchTimer = setTimeout(flushCartOps, CART_BATCH_DELAY);
 }
 
+// 페이지를 떠나기 전에 남은 요청을 보낸다
+window.addEventListener('pagehide', function () {
+    if (pendingCartOps.size === 0) return;
+    const ops = Array.from(pendingCartOps.entries())
+        .filter(([, op]) => (op.action === 'add') !== op.wasFilled)
+        .map(([productId, op]) => ({ action: op.action, product_id: productId }));
+    pendingCartOps.clear();
+    if (ops.length > 0) {
+        navigator.sendBeacon('/cart/batch', new Blob([JSON.stringify({ ops: ops })], { type: 'application/json' }));
+    }
+});
+
 // ================================
 // 즉시 스크롤 위치 설정 (페이지 로드 전)
 // ================================
@@ -206,4 +234,67 @@ window.resetBrandFilter = function () {
   document.querySelectorAll('#brandFilterForm input[type="checkbox"]').forEach(cb => (cb.checked = false));
   const dropdown = bootstrap.Dropdown.getInstance(document.getElementById('brandDropdown'));
   if (dropdown) dropdown.hide();
-};
\ No newline at end of file
+};
+window.resetPriceFilter = function () {
+  const form = document.getElementById('priceFilterForm');
+  form.querySelectorAll('input[type="number"]').forEach(input => (input.value = ''));
+  const minRange = document.getElementById('priceRangeMin');
+  const maxRange = document.getElementById('priceRangeMax');
+  if (minRange) minRange.value = minRange.min;
+  if (maxRange) maxRange.value = maxRange.max;
+  updatePriceHistogram();
+  const dropdown = bootstrap.Dropdown.getInstance(document.getElementById('priceDropdown'));
+  if (dropdown) dropdown.hide();
+};
+
+// ================================
+// 가격 슬라이더 (슬라이더 ↔ 숫자 입력 동기화, 범위 밖 히스토그램 구간 흐리게)
+// ================================
+function updatePriceHistogram() {
+  const histogram = document.querySelector('.price-histogram');
+  if (!histogram || !histogram.dataset.edges) return;
+  const edges = histogram.dataset.edges.split(',').map(Number);
+  const minValue = document.getElementById('minPrice').value;
+  const maxValue = document.getElementById('maxPrice').value;
+  histogram.querySelectorAll('.price-histogram-bar').forEach((bar, i) => {
+    const outside = (minValue !== '' && edges[i + 1] < Number(minValue)) ||
+                    (maxValue !== '' && edges[i] > Number(maxValue));
+    bar.classList.toggle('out-of-range', outside);
+  });
+}
+
+document.addEventListener('DOMContentLoaded', function () {
+  const form = document.getElementById('priceFilterForm');
+  if (!form) return;
+  const minRange = document.getElementById('priceRangeMin');
+  const maxRange = document.getElementById('priceRangeMax');
+  const minInput = document.getElementById('minPrice');
+  const maxInput = document.getElementById('maxPrice');
+
+  if (minRange && maxRange) {
+    // 슬라이더를 끝까지 당기면 해당 조건은 비운다 (전체 범위)
+    minRange.addEventListener('input', function () {
+      if (Number(minRange.value) > Number(maxRange.value)) minRange.value = maxRange.value;
+      minInput.value = minRange.value === minRange.min ? '' : minRange.value;
+      updatePriceHistogram();
+    });
+    maxRange.addEventListener('input', function () {
+      if (Number(maxRange.value) < Number(minRange.value)) maxRange.value = minRange.value;
+      maxInput.value = maxRange.value === maxRange.max ? '' : maxRange.value;
+      updatePriceHistogram();
+    });
+    minInput.addEventListener('input', function () {
+      minRange.value = minInput.value === '' ? minRange.min : minInput.value;
+      updatePriceHistogram();
+    });
+    maxInput.addEventListener('input', function () {
+      maxRange.value = maxInput.value === '' ? maxRange.max : maxInput.value;
+      updatePriceHistogram();
+    });
+  }
+
+  // 비어 있는 가격 입력은 URL 에 넣지 않는다
+  form.addEventListener('submit', function () {
+    [minInput, maxInput].forEach(input => (input.disabled = input.value === ''));
+  });
+});
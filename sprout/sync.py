@@ -0,0 +1,208 @@
+import json
+import re
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, or_
+
+from sprout import db
+from sprout.models import CartItem, Product
+
+
+# ========== 장바구니 스냅샷 갱신 ==========
+SNAPSHOT_COLUMNS = ('brand', 'name', 'price', 'description', 'image_url', 'style')
+ID_CHUNK_SIZE = 500
+
+
+def refresh_cart_snapshots(product_ids=None):
+    """CartItem 의 상품 스냅샷을 Product 기준으로 갱신하고, 실제로 바뀐 행 수를 돌려준다.
+
+    product_ids 를 주면 해당 상품이 담긴 행만 갱신한다 (None 이면 전체).
+    ORM 객체를 순회하지 않고 UPDATE ... FROM product 한 문장으로 처리하며,
+    값이 이미 같은 행은 WHERE 조건에서 제외되어 건드리지 않는다.
+    """
+    cart = CartItem.__table__
+    product = Product.__table__
+
+    stmt = (
+        db.update(cart)
+        .values({col: product.c[col] for col in SNAPSHOT_COLUMNS})
+        .where(cart.c.product_id == product.c.id)
+        .where(or_(*(cart.c[col].is_distinct_from(product.c[col]) for col in SNAPSHOT_COLUMNS)))
+    )
+
+    if product_ids is None:
+        touched = db.session.execute(stmt).rowcount
+    else:
+        # IN 목록이 너무 길어지지 않도록 나눠서 실행 (SQLite 바인드 변수 개수 제한)
+        product_ids = list(product_ids)
+        touched = 0
+        for i in range(0, len(product_ids), ID_CHUNK_SIZE):
+            chunk = product_ids[i:i + ID_CHUNK_SIZE]
+            touched += db.session.execute(stmt.where(product.c.id.in_(chunk))).rowcount
+
+    db.session.commit()
+    return touched
+
+
+# ========== products.json 스트리밍 읽기 ==========
+PRODUCTS_KEY = re.compile(r'"products"\s*:\s*\[')
+
+
+def iter_products(path, chunk_size=1 << 16):
+    """products.json 의 상품 배열을 한 건씩 돌려준다 (파일 전체를 메모리에 올리지 않음).
+
+    {"products": [...]} 형태와 최상위 배열 [...] 형태를 모두 지원한다.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buf = ''
+        eof = False
+
+        def read_more():
+            nonlocal buf, eof
+            chunk = f.read(chunk_size)
+            if not chunk:
+                eof = True
+            buf += chunk
+
+        # 상품 배열의 시작 위치 찾기
+        pos = None
+        while pos is None:
+            stripped = buf.lstrip()
+            if stripped.startswith('['):
+                pos = len(buf) - len(stripped) + 1
+                break
+            match = PRODUCTS_KEY.search(buf)
+            if match:
+                pos = match.end()
+                break
+            if eof:
+                raise ValueError(f'{path}: 상품 배열을 찾을 수 없습니다')
+            read_more()
+
+        while True:
+            # 공백/쉼표 건너뛰기
+            while True:
+                while pos < len(buf) and buf[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buf) or eof:
+                    break
+                buf, pos = buf[pos:], 0
+                read_more()
+
+            if pos >= len(buf):
+                raise ValueError(f'{path}: 상품 배열이 닫히지 않았습니다')
+            if buf[pos] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                # 객체가 청크 경계에서 잘린 경우: 더 읽고 다시 시도
+                buf, pos = buf[pos:], 0
+                read_more()
+                continue
+
+            yield item
+            # 버퍼는 더 읽을 때만 잘라낸다 (객체마다 자르면 청크 크기만큼 복사가 반복됨)
+            pos = end
+
+
+# ========== 상품 동기화 (JSON -> product 테이블) ==========
+PRODUCT_COLUMNS = ('brand', 'name', 'price', 'description', 'image_url', 'style')
+
+
+def _staging_table():
+    return Table(
+        'product_stage', MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('brand', String(100)),
+        Column('name', String(150), nullable=False),
+        Column('price', Integer, nullable=False),
+        Column('description', Text),
+        Column('image_url', String(255)),
+        Column('style', String(50)),
+        prefixes=['TEMPORARY'],
+    )
+
+
+def sync_products(path, batch_size=5000, log=print):
+    """products.json 을 product 테이블과 동기화하고 결과 통계를 돌려준다.
+
+    1. JSON 을 스트리밍으로 읽어 임시 스테이징 테이블에 executemany 로 적재
+    2. 스테이징과 product 를 집합 단위로 비교해서 추가 / 변경 / 삭제를 각각 한 문장으로 반영
+    3. 변경된 상품이 담긴 장바구니 스냅샷 갱신
+    메모리에는 배치 하나 분량만 올라간다.
+    """
+    product = Product.__table__
+    stage = _staging_table()
+    conn = db.session.connection()
+    stage.create(conn)
+
+    try:
+        # ---------- 1. 스테이징 적재 ----------
+        insert_stage = stage.insert().prefix_with('OR REPLACE')  # 같은 id 가 여러 번 나오면 마지막 값 사용
+        staged = skipped = 0
+        batch = []
+        for item in iter_products(path):
+            if item.get('id') is None or item.get('name') is None or item.get('price') is None:
+                skipped += 1
+                continue
+            batch.append({'id': item['id'], **{col: item.get(col) for col in PRODUCT_COLUMNS}})
+            if len(batch) >= batch_size:
+                conn.execute(insert_stage, batch)
+                staged += len(batch)
+                batch = []
+        if batch:
+            conn.execute(insert_stage, batch)
+            staged += len(batch)
+        log(f"📥 스테이징 적재: {staged}건 (건너뜀 {skipped}건)")
+
+        # ---------- 2. diff 반영 ----------
+        differs = or_(*(product.c[col].is_distinct_from(stage.c[col]) for col in PRODUCT_COLUMNS))
+
+        # 변경: 값이 하나라도 다른 상품 id (장바구니 스냅샷 갱신에 사용)
+        changed_ids = conn.execute(
+            db.select(stage.c.id).join(product, product.c.id == stage.c.id).where(differs)
+        ).scalars().all()
+        if changed_ids:
+            conn.execute(
+                db.update(product)
+                .values({col: stage.c[col] for col in PRODUCT_COLUMNS})
+                .where(product.c.id == stage.c.id)
+                .where(differs)
+            )
+
+        # 추가: product 에 없는 id
+        new_rows = (
+            db.select(stage.c.id, *(stage.c[col] for col in PRODUCT_COLUMNS),
+                      db.literal(datetime.now()).label('created_date'))
+            .outerjoin(product, product.c.id == stage.c.id)
+            .where(product.c.id.is_(None))
+        )
+        inserted = conn.execute(
+            db.insert(product).from_select(['id', *PRODUCT_COLUMNS, 'created_date'], new_rows)
+        ).rowcount
+
+        # 삭제: JSON 에 없는 id
+        deleted = conn.execute(
+            db.delete(product).where(product.c.id.not_in(db.select(stage.c.id)))
+        ).rowcount
+    finally:
+        stage.drop(conn)
+
+    db.session.commit()
+
+    # ---------- 3. 장바구니 스냅샷 갱신 ----------
+    refreshed = refresh_cart_snapshots(changed_ids) if changed_ids else 0
+
+    return {
+        'staged': staged,
+        'skipped': skipped,
+        'inserted': inserted,
+        'updated': len(changed_ids),
+        'deleted': deleted,
+        'cart_snapshots_refreshed': refreshed,
+    }
@@ -0,0 +1,71 @@
+import logging
+import os
+import time
+
+import click
+from flask import current_app
+from jinja2 import FileSystemBytecodeCache
+
+logger = logging.getLogger(__name__)
+
+
+# ========== Jinja 바이트코드 캐시 ==========
+# 템플릿을 처음 쓸 때마다 소스를 파싱/컴파일하지 않도록 컴파일 결과를 TEMPLATE_BYTECODE_CACHE_DIR 에 저장한다.
+# 캐시 항목은 템플릿 소스의 체크섬으로 검증되므로 템플릿을 고치면 자동으로 다시 컴파일된다.
+#   flask compile-templates      # 빌드 시점에 모든 템플릿을 미리 컴파일하고 소스/캐시 로드 시간을 비교 출력
+# 워커가 새로 뜨거나(max_requests 로 교체) 배포 직후의 첫 요청도 캐시에서 바로 읽는다.
+
+def init_templates(app):
+    app.cli.add_command(compile_templates_command)
+
+    cache_dir = app.config.get('TEMPLATE_BYTECODE_CACHE_DIR')
+    if not cache_dir:
+        return
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+    except OSError as e:
+        # 읽기 전용 파일시스템 등: 캐시 없이 기존처럼 동작한다
+        logger.warning('템플릿 바이트코드 캐시 디렉터리를 만들 수 없습니다 (%s): %s', cache_dir, e)
+        return
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+
+def _template_names(env):
+    return [name for name in env.list_templates() if name.endswith('.html')]
+
+
+def _load_all(env, names):
+    # 템플릿별 로드 시간 (ms)
+    timings = {}
+    for name in names:
+        started = time.perf_counter()
+        env.get_template(name)
+        timings[name] = (time.perf_counter() - started) * 1000
+    return timings
+
+
+@click.command('compile-templates')
+@click.option('--clear', is_flag=True, help='기존 캐시를 지우고 다시 컴파일한다')
+def compile_templates_command(clear):
+    """모든 템플릿을 바이트코드 캐시에 미리 컴파일하고 콜드 스타트 시간을 비교한다."""
+    env = current_app.jinja_env
+    cache = env.bytecode_cache
+    if cache is None:
+        raise click.ClickException('TEMPLATE_BYTECODE_CACHE_DIR 가 설정되어 있지 않습니다')
+    if clear:
+        cache.clear()
+
+    names = _template_names(env)
+    # 새 워커와 같은 조건이 되도록 메모리 캐시가 없는 환경(overlay)에서 잰다
+    from_source = _load_all(env.overlay(bytecode_cache=None, cache_size=0), names)
+    _load_all(env.overlay(cache_size=0), names)  # 캐시에 없거나 소스가 바뀐 템플릿을 컴파일해서 저장
+    from_cache = _load_all(env.overlay(cache_size=0), names)
+
+    click.echo(f'{"템플릿":28s} {"소스 컴파일":>12s} {"캐시 로드":>10s}')
+    for name in names:
+        click.echo(f'{name:28s} {from_source[name]:10.2f}ms {from_cache[name]:8.2f}ms')
+    source_total = sum(from_source.values())
+    cache_total = sum(from_cache.values())
+    click.echo(f'{"합계":28s} {source_total:10.2f}ms {cache_total:8.2f}ms'
+               f'  ({source_total / cache_total if cache_total else 0:.1f}배)')
+    click.echo(f'템플릿 {len(names)}개를 {cache.directory} 에 저장했습니다')
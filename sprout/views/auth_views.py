@@ -1,13 +1,19 @@
 import functools
+import logging
 
-from flask import Blueprint, request, redirect, url_for, flash, render_template, session, g
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, redirect, url_for, flash, render_template, session, g, jsonify
 
 from sprout import db
 from sprout.forms import UserCreateForm, UserLoginForm
+from sprout.hashing import HashingBusy, password_hasher
+from sprout.identity import load_identity, identity_stats
 from sprout.models import User
 
 bp = Blueprint('auth', __name__, url_prefix='/')
+logger = logging.getLogger(__name__)
+
+BUSY_MESSAGE = '요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.'
+LOGIN_FAILED_MESSAGE = '아이디 또는 비밀번호가 올바르지 않습니다.'
 
 
 @bp.route('/signup/', methods=['GET', 'POST'])
@@ -30,7 +36,7 @@ def signup():
         try:
             user = User(
                 username=form.username.data,
-                password=generate_password_hash(form.password1.data),
+                password=password_hasher.hash(form.password1.data),
                 email=form.email.data,
                 phone=form.phone.data
             )
@@ -38,10 +44,13 @@ def signup():
             db.session.commit()
             flash('회원가입이 완료되었습니다.', 'success')
             return redirect(url_for('auth.login'))
+        except HashingBusy:
+            flash(BUSY_MESSAGE, 'danger')
+            return render_template('auth/signup.html', form=form), 503
         except Exception as e:
             db.session.rollback()
             flash('회원가입 중 오류가 발생했습니다. 다시 시도해주세요.', 'danger')
-            print(f"회원가입 오류: {e}")
+            logger.exception('회원가입 오류: %s', e)
             return render_template('auth/signup.html', form=form)
 
     return render_template('auth/signup.html', form=form)
@@ -53,10 +62,20 @@ def login():
     if request.method == 'POST' and form.validate_on_submit():
         errormsg = None
         user = User.query.filter_by(username=form.username.data).first()
-        if not user:
-            errormsg = '존재하지 않는 사용자입니다.'
-        elif not check_password_hash(user.password, form.password.data):
-            errormsg = '비밀번호가 올바르지 않습니다.'
+        try:
+            # 사용자 존재 여부가 드러나지 않도록 두 경우 모두 같은 메시지를 쓴다
+            if not user:
+                password_hasher.verify_unknown(form.password.data)
+                errormsg = LOGIN_FAILED_MESSAGE
+            elif not password_hasher.verify(user.password, form.password.data):
+                errormsg = LOGIN_FAILED_MESSAGE
+            elif password_hasher.needs_rehash(user.password):
+                # 해시 설정이 바뀌었으면 로그인 성공 시 새 설정으로 다시 저장
+                user.password = password_hasher.hash(form.password.data)
+                db.session.commit()
+        except HashingBusy:
+            flash(BUSY_MESSAGE)
+            return render_template('auth/login.html', form=form), 503
         if errormsg is None:
             session.clear()
             session['user_id'] = user.id
@@ -73,11 +92,28 @@ def login():
 # 라우팅 함수보다 먼저 실행하는 함수
 @bp.before_app_request
 def load_logged_in_user():
+    # 정적 파일은 사용자와 무관하므로 세션을 읽지 않는다 (공유 캐시가 쓸 수 있도록 Vary: Cookie 를 붙이지 않음)
+    if request.endpoint in ('static', 'assets'):
+        g.user = None
+        return
+
     user_id = session.get('user_id')
     if user_id is None:
         g.user = None
     else:
-        g.user = User.query.get(user_id)
+        g.user = load_identity(user_id)
+
+
+# 캐시된 사용자 조회 통계 (절약한 조회 수 포함)
+def identity_stats_view():
+    return jsonify(identity_stats())
+
+
+# 운영 카운터는 /__metrics 와 같이 PROFILING_ENABLED 일 때만 등록한다
+@bp.record_once
+def register_identity_stats(state):
+    if state.app.config.get('PROFILING_ENABLED'):
+        state.add_url_rule('/api/identity/stats', 'identity_stats_view', identity_stats_view)
 
 
 # 로그아웃
@@ -1,10 +1,16 @@
-from flask import Blueprint, render_template, request, jsonify, g, session
-from sprout import db
-from sprout.models import CartItem, Product
-import json
+from flask import Blueprint, render_template, request, jsonify, g, session, current_app, stream_template
+from markupsafe import Markup
+from sqlalchemy import func
+from sprout import cart, db
+from sprout.cache import LRUCache
+from sprout.catalog import catalog
+from sprout.http_cache import make_etag, is_not_modified, not_modified, with_etag
+from sprout.models import Product, User
+import logging
 import math
 
 bp = Blueprint('product', __name__, url_prefix='/')
+logger = logging.getLogger(__name__)
 
 
 # ========== 페이지네이션 클래스 ==========
@@ -44,77 +50,244 @@ class ProductPagination:
                 last = num
 
 
-# ========== JSON 데이터 로드 ==========
-def load_products():
-    try:
-        with open('data/products.json', 'r', encoding='utf-8') as f:
-            return json.load(f).get('products', [])
-    except FileNotFoundError:
-        print("❌ ERROR: data/products.json 파일을 찾을 수 없습니다!")
-        return []
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON 파싱 오류: {e}")
-        return []
+# ========== DB 기반 목록 조회 ==========
+# 검색/필터/정렬/페이지네이션을 모두 SQL 로 내려보내 요청당 메모리를 페이지 크기로 제한한다
+def query_products_db(search='', styles=(), brands=(), sort='default', offset=0, limit=25,
+                      min_price=None, max_price=None):
+    conditions = []
+    if search:
+        conditions.append(func.lower(Product.name).contains(search, autoescape=True))
+    if styles:
+        conditions.append(Product.style.in_(styles))
+    if brands:
+        conditions.append(Product.brand.in_(brands))
+    # 가격 범위는 ix_product_price (스타일/브랜드가 함께 있으면 복합 인덱스) 범위 스캔
+    if min_price is not None:
+        conditions.append(Product.price >= min_price)
+    if max_price is not None:
+        conditions.append(Product.price <= max_price)
+
+    if sort == 'price_low':
+        order_by = (Product.price.asc(), Product.id.asc())
+    elif sort == 'price_high':
+        order_by = (Product.price.desc(), Product.id.asc())
+    else:
+        order_by = (Product.id.asc(),)
+
+    total = db.session.scalar(db.select(func.count(Product.id)).where(*conditions))
+    items = db.session.scalars(
+        db.select(Product).where(*conditions).order_by(*order_by).offset(offset).limit(limit)
+    ).all()
+    return items, total
+
+
+# ========== 목록 파라미터 ==========
+SORT_OPTIONS = ('default', 'price_low', 'price_high', 'new')
+
+
+# 같은 조건이면 같은 값이 되도록 정규화한다 (다중 선택값 정렬/중복 제거, 검색어 소문자)
+def get_listing_params():
+    search_query = request.args.get('search', '').strip().lower()
+    selected_styles = sorted(set(request.args.getlist('style')))
+    selected_brands = sorted(set(request.args.getlist('brand')))
+    sort_by = request.args.get('sort', 'default')
+    if sort_by not in SORT_OPTIONS:
+        sort_by = 'default'
+    return search_query, selected_styles, selected_brands, sort_by
+
+
+# 가격 범위 (?min_price=&max_price=). 숫자가 아니거나 음수면 무시하고, 거꾸로 들어오면 바꾼다
+def get_price_range():
+    min_price = request.args.get('min_price', type=int)
+    max_price = request.args.get('max_price', type=int)
+    if min_price is not None and min_price < 0:
+        min_price = None
+    if max_price is not None and max_price < 0:
+        max_price = None
+    if min_price is not None and max_price is not None and min_price > max_price:
+        min_price, max_price = max_price, min_price
+    return min_price, max_price
+
+
+# ========== 제품 그리드 캐시 ==========
+# 렌더링된 product_grid.html 조각을 정규화된 파라미터 + 카탈로그 버전으로 캐시한다.
+# 사용자별 정보(찜 하트 상태)는 /cart/check 로 따로 가져오므로 조각은 모든 사용자가 공유한다.
+grid_cache = LRUCache()
+
+
+@bp.record_once
+def configure_grid_cache(state):
+    grid_cache.configure(
+        state.app.config.get('SUB_FRAGMENT_CACHE_SIZE', 512),
+        state.app.config.get('SUB_FRAGMENT_CACHE_TTL', 300),
+    )
+
+
+# ========== 스트리밍 렌더링 ==========
+# Jinja 는 출력 조각을 아주 잘게 내보내므로, 일정 크기만큼 모아서 보낸다 (헤더/사이드바가 첫 덩어리로 나감)
+def buffered(chunks, size):
+    buffer = []
+    length = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield ''.join(buffer)
+            buffer = []
+            length = 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def get_per_page():
+    default = current_app.config.get('SUB_PER_PAGE', 25)
+    per_page = request.args.get('per_page', default, type=int)
+    return min(max(per_page, 1), current_app.config.get('SUB_MAX_PER_PAGE', 200))
 
 
 # ========== sub 페이지 (검색 + 필터 + 페이지네이션) ==========
 @bp.route('/sub')
 def sub():
-    products = load_products()
-
     # 검색어 & 스타일 파라미터 가져오기
-    search_query = request.args.get('search', '').strip().lower()
-    selected_styles = request.args.getlist('style')
-    selected_brands = request.args.getlist('brand')
-    sort_by = request.args.get('sort', 'default')
+    search_query, selected_styles, selected_brands, sort_by = get_listing_params()
+    min_price, max_price = get_price_range()
 
-    print(f"\n=== 필터링 정보 ===")
-    print(f"검색어: {search_query}")
-    print(f"선택된 스타일: {selected_styles}")
-    print(f"선택된 브랜드: {selected_brands}")
-    print(f"정렬 기준: {sort_by}")
-
-    # 검색 필터링
-    if search_query:
-        products = [p for p in products if search_query in p.get('name', '').lower()]
-
-    # 스타일 필터링
-    if selected_styles:
-        products = [p for p in products if p.get('style', '').strip() in selected_styles]
-        print(f"스타일 필터링 후 상품 수: {len(products)}")
-
-    # 브랜드 필터링 (여러 개 선택 가능)
-    if selected_brands:
-        products = [p for p in products if p.get('brand', '').strip() in selected_brands]
-        print(f"브랜드 필터링 후 상품 수: {len(products)}")
-
-    # 정렬 처리
-    if sort_by == 'price_low':
-        products.sort(key=lambda x: x.get('price', 0))
-        print("낮은 가격순으로 정렬")
-    elif sort_by == 'price_high':
-        products.sort(key=lambda x: x.get('price', 0), reverse=True)
-        print("높은 가격순으로 정렬")
+    logger.debug('필터링 정보: 검색어=%s 스타일=%s 브랜드=%s 정렬=%s',
+                 search_query, selected_styles, selected_brands, sort_by)
 
     # 페이지네이션 처리
-    page = request.args.get('page', 1, type=int)
-    per_page = 25
-    total = len(products)
-    start = (page - 1) * per_page
-    end = start + per_page
-    current_products = products[start:end]
-
-    product_list = ProductPagination(current_products, page, per_page, total)
-
-    # sub.html로 전달
-    return render_template(
-        'sub.html',
+    page = max(request.args.get('page', 1, type=int), 1)
+    per_page = get_per_page()
+    # 기본값과 다를 때만 링크/폼에 per_page 를 붙인다
+    per_page_param = per_page if per_page != current_app.config.get('SUB_PER_PAGE', 25) else None
+
+    # 한 페이지에 상품이 많으면 그리드를 만들면서 바로 내보낸다 (첫 바이트가 빨리 나가도록)
+    stream_min = current_app.config.get('SUB_STREAM_MIN_PER_PAGE')
+    streaming = stream_min is not None and per_page >= stream_min
+
+    snapshot = catalog.snapshot()
+    source = current_app.config.get('PRODUCT_LISTING_SOURCE')
+    cache_key = (snapshot.version, source, search_query, tuple(selected_styles),
+                 tuple(selected_brands), sort_by, page, per_page, min_price, max_price)
+
+    # 카탈로그 버전 + 정규화된 파라미터가 같으면 렌더링 없이 304
+    etag = make_etag('sub', *cache_key)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    # 스트리밍할 큰 페이지는 그리드를 캐시하지 않는다
+    grid_html = None if streaming else grid_cache.get(cache_key)
+    product_list = None
+    if grid_html is None:
+        # 필터링/정렬은 카탈로그의 비트셋 인덱스와 가격순 순열로 처리한다 (DB 모드면 SQL 로 처리)
+        query = query_products_db if source == 'db' else snapshot.query
+        current_products, total = query(
+            search=search_query,
+            styles=selected_styles,
+            brands=selected_brands,
+            sort=sort_by,
+            offset=(page - 1) * per_page,
+            limit=per_page,
+            min_price=min_price,
+            max_price=max_price,
+        )
+        logger.debug('필터링 후 상품 수: %d', total)
+
+        product_list = ProductPagination(current_products, page, per_page, total)
+        if not streaming:
+            grid_html = Markup(render_template(
+                'product_grid.html',
+                product_list=product_list,
+                selected_styles=selected_styles,
+                selected_brands=selected_brands,
+                search_query=search_query,
+                current_sort=sort_by,
+                per_page_param=per_page_param,
+                min_price=min_price,
+                max_price=max_price
+            ))
+            grid_cache.set(cache_key, grid_html)
+
+    # 필터 사이드바 카운트 (카탈로그 스냅샷의 패싯 집계에서 계산)
+    facets = snapshot.facet_counts(search_query, selected_styles, selected_brands, min_price, max_price)
+    # 가격 슬라이더 히스토그램 ((스타일, 브랜드) 조합별로 미리 센 구간 카운트의 합)
+    price_histogram = snapshot.price_histogram(search_query, selected_styles, selected_brands)
+
+    # sub.html로 전달 (grid_html 이 없으면 sub.html 안에서 product_grid.html 을 include 해서 렌더링)
+    context = dict(
+        grid_html=grid_html,
         product_list=product_list,
         selected_styles=selected_styles,
         selected_brands=selected_brands,
         search_query=search_query,
-        current_sort=sort_by
+        current_sort=sort_by,
+        per_page_param=per_page_param,
+        min_price=min_price,
+        max_price=max_price,
+        price_histogram=price_histogram,
+        style_counts=facets['styles'],
+        brand_counts=facets['brands']
     )
+    if streaming:
+        # 스트리밍 응답은 압축/그리드 캐시 대상이 아니다 (큰 페이지의 첫 바이트 시간을 우선)
+        chunk_size = current_app.config.get('SUB_STREAM_CHUNK_SIZE', 8192)
+        chunks = buffered(stream_template('sub.html', **context), chunk_size)
+        return with_etag(current_app.response_class(chunks, mimetype='text/html'), etag)
+    return with_etag(render_template('sub.html', **context), etag)
+
+
+# ========== 상세 페이지 ==========
+# 템플릿에서 url_for('product_detail') 로 쓰이므로 블루프린트가 아닌 앱에 직접 등록한다 (create_app)
+def product_detail():
+    product_id = request.args.get("product_id")
+
+    # product_id가 없거나 정수가 아닐 때 처리
+    try:
+        product_id = int(product_id)
+    except (TypeError, ValueError):
+        return " 잘못된 product_id 형식입니다.", 400
+
+    # 카탈로그 버전이 같으면 렌더링 없이 304
+    snapshot = catalog.snapshot()
+    etag = make_etag("product_detail", snapshot.version, product_id)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    # 프로세스 상주 카탈로그에서 id로 바로 조회 (O(1))
+    product = snapshot.by_id.get(product_id)
+
+    if not product:
+        return f" id={product_id}에 해당하는 상품을 찾을 수 없습니다.", 404
+
+    return with_etag(render_template("product_detail.html", product=product), etag)
+
+
+# ========== 패싯 카운트 API ==========
+@bp.route('/api/facets')
+def facets():
+    search_query, selected_styles, selected_brands, _ = get_listing_params()
+    min_price, max_price = get_price_range()
+    snapshot = catalog.snapshot()
+    counts = snapshot.facet_counts(search_query, selected_styles, selected_brands, min_price, max_price)
+    counts['total'] = snapshot.filter_bits(search_query, selected_styles, selected_brands,
+                                           min_price, max_price).bit_count()
+    counts['price_histogram'] = snapshot.price_histogram(search_query, selected_styles, selected_brands)
+    counts['version'] = snapshot.version
+    return jsonify(counts)
+
+
+# ========== 카탈로그 상태 (hit/reload 카운터) ==========
+def catalog_stats():
+    stats = catalog.stats()
+    stats['grid_cache'] = grid_cache.stats()
+    return jsonify(stats)
+
+
+# 운영 카운터는 /__metrics 와 같이 PROFILING_ENABLED 일 때만 등록한다
+@bp.record_once
+def register_catalog_stats(state):
+    if state.app.config.get('PROFILING_ENABLED'):
+        state.add_url_rule('/api/catalog/stats', 'catalog_stats', catalog_stats)
 
 
 # ========== DB 장바구니 기능 ==========
@@ -126,48 +299,29 @@ def cart_add():
     data = request.get_json()
     product_id = data.get('product_id')
 
-    print(f"\n장바구니 추가 요청:")
-    print(f"  - 사용자: {g.user.username} (ID: {g.user.id})")
-    print(f"  - Product ID: {product_id}")
+    logger.debug('장바구니 추가 요청: user_id=%s product_id=%s', g.user.id, product_id)
 
     if not product_id:
         return jsonify({'success': False, 'message': 'Product ID is required'}), 400
+    try:
+        product_id = int(product_id)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid product ID'}), 400
 
-    # 이미 장바구니에 있는지 확인
-    existing = CartItem.query.filter_by(user_id=g.user.id, product_id=product_id).first()
-
-    if existing:
-        print(f"이미 장바구니에 존재함")
-        return jsonify({'success': True, 'message': 'Already in cart'})
-
-    # Product 테이블에서 상품 정보 조회
-    product = db.session.get(Product, product_id)
+    # 확인 후 삽입 대신 유니크 인덱스 기준으로 충돌을 무시하고 삽입한다 (동시 클릭에도 중복 없음)
+    added, _, not_found = cart.apply_changes(g.user, add_ids=[product_id])
 
-    if not product:
-        print(f"  ❌ 상품을 찾을 수 없음 (Product ID: {product_id})")
+    if not_found:
+        logger.info('상품을 찾을 수 없음: product_id=%s', product_id)
         return jsonify({'success': False, 'message': 'Product not found'}), 404
 
-    # CartItem 생성 시 상품 정보 + username 함께 저장
-    new_item = CartItem(
-        user_id=g.user.id,
-        username=g.user.username,
-        product_id=product_id,
-        brand=product.brand,
-        name=product.name,
-        price=product.price,
-        image_url=product.image_url,
-        style=product.style
-    )
-    db.session.add(new_item)
     db.session.commit()
 
-    print(f"  ✅ 장바구니에 추가 완료")
-    print(f"     - CartItem ID: {new_item.id}")
-    print(f"     - 사용자: {new_item.username}")
-    print(f"     - 상품명: {new_item.name}")
-    print(f"     - 브랜드: {new_item.brand}")
-    print(f"     - 가격: {new_item.price}")
+    if not added:
+        logger.debug('이미 장바구니에 존재함: product_id=%s', product_id)
+        return jsonify({'success': True, 'message': 'Already in cart'})
 
+    logger.debug('장바구니에 추가 완료: user=%s product_id=%s', g.user.username, product_id)
     return jsonify({'success': True, 'message': 'Added to cart'})
 
 
@@ -179,31 +333,89 @@ def cart_remove():
     data = request.get_json()
     product_id = data.get('product_id')
 
-    print(f"\n장바구니 삭제 요청:")
-    print(f"  - 사용자: {g.user.username} (ID: {g.user.id})")
-    print(f"  - Product ID: {product_id}")
+    logger.debug('장바구니 삭제 요청: user_id=%s product_id=%s', g.user.id, product_id)
 
     if not product_id:
         return jsonify({'success': False, 'message': 'Product ID is required'}), 400
+    try:
+        product_id = int(product_id)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'message': 'Invalid product ID'}), 400
 
-    item = CartItem.query.filter_by(user_id=g.user.id, product_id=product_id).first()
+    _, removed, _ = cart.apply_changes(g.user, remove_ids=[product_id])
 
-    if item:
-        db.session.delete(item)
+    if removed:
         db.session.commit()
-        print(f"  ✅ 장바구니에서 삭제 완료")
+        logger.debug('장바구니에서 삭제 완료: product_id=%s', product_id)
         return jsonify({'success': True, 'message': 'Removed from cart'})
 
-    print(f"삭제할 아이템을 찾을 수 없음")
+    logger.debug('삭제할 아이템을 찾을 수 없음: product_id=%s', product_id)
     return jsonify({'success': False, 'message': 'Item not found'}), 404
 
 
+# 여러 추가/삭제 요청을 한 번에 처리 (sub.js 에서 하트 클릭을 모아서 보낸다)
+# 요청 형식: {"ops": [{"action": "add" | "remove", "product_id": 1}, ...]}
+# 같은 상품에 대한 요청이 여러 개면 마지막 요청만 반영한다.
+@bp.route('/cart/batch', methods=['POST'])
+def cart_batch():
+    if not session.get('user_id'):
+        return jsonify({'success': False, 'message': 'Login required', 'redirect': True}), 401
+
+    data = request.get_json(silent=True) or {}
+    ops = data.get('ops')
+    if not isinstance(ops, list) or len(ops) > current_app.config.get('CART_BATCH_MAX_OPS', 200):
+        return jsonify({'success': False, 'message': 'Invalid ops'}), 400
+
+    final = {}
+    for op in ops:
+        action = op.get('action') if isinstance(op, dict) else None
+        product_id = op.get('product_id') if isinstance(op, dict) else None
+        if action not in ('add', 'remove') or not isinstance(product_id, int) or isinstance(product_id, bool):
+            return jsonify({'success': False, 'message': 'Invalid ops'}), 400
+        final[product_id] = action
+
+    add_ids = [pid for pid, action in final.items() if action == 'add']
+    remove_ids = [pid for pid, action in final.items() if action == 'remove']
+    logger.debug('장바구니 일괄 요청: user_id=%s add=%s remove=%s', g.user.id, add_ids, remove_ids)
+
+    added, removed, not_found = cart.apply_changes(g.user, add_ids, remove_ids)
+    db.session.commit()
+
+    return jsonify({
+        'success': True,
+        'added': added,
+        'removed': removed,
+        'not_found': not_found,
+    })
+
+
 @bp.route('/cart/check')
 def cart_check():
     if not session.get('user_id'):
         return jsonify({'cart_items': [], 'logged_in': False})
 
-    cart_items = CartItem.query.filter_by(user_id=g.user.id).all()
-    cart_item_ids = [item.product_id for item in cart_items]
-
-    return jsonify({'cart_items': cart_item_ids, 'logged_in': True})
\ No newline at end of file
+    # ?ids=1,2,3 : 지금 화면에 보이는 상품 중 장바구니에 있는 것만 돌려준다 (없으면 장바구니 전체)
+    ids = None
+    if 'ids' in request.args:
+        try:
+            ids = sorted({int(v) for value in request.args.getlist('ids') for v in value.split(',') if v})
+        except ValueError:
+            return jsonify({'success': False, 'message': 'Invalid ids'}), 400
+        if len(ids) > current_app.config.get('CART_CHECK_MAX_IDS', 200):
+            return jsonify({'success': False, 'message': 'Too many ids'}), 400
+
+    # cart_version 이 같으면 CartItem 을 조회하지 않고 304
+    # (g.user 는 캐시된 스냅샷이므로 cart_version 은 매번 PK 로 직접 읽는다)
+    cart_version = db.session.scalar(db.select(User.cart_version).where(User.id == g.user.id))
+    etag = make_etag('cart', g.user.id, cart_version, ids, per_user=False)
+    if is_not_modified(etag):
+        return not_modified(etag)
+
+    # 장바구니 상품 id 는 cart_version 으로 검증되는 프로세스별 캐시에서 읽는다 (없을 때만 product_id 조회)
+    cart_item_ids = cart.cart_product_ids(g.user.id, cart_version)
+    if ids is not None:
+        cart_item_ids = [pid for pid in ids if pid in cart_item_ids]
+    else:
+        cart_item_ids = sorted(cart_item_ids)
+
+    return with_etag(jsonify({'cart_items': cart_item_ids, 'logged_in': True}), etag)
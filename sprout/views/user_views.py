@@ -1,9 +1,12 @@
 from flask import Blueprint, render_template, request, g, session, redirect, url_for
 from sprout import db
 from sprout.models import CartItem, Product
+from sqlalchemy import and_, func, or_
+import logging
 import math
 
 bp = Blueprint('user', __name__, url_prefix='/')
+logger = logging.getLogger(__name__)
 
 
 # 로그인 데코레이터
@@ -56,78 +59,53 @@ class PaginatedItems:
 @bp.route('/mypage')
 @login_required
 def mypage():
-    page = request.args.get('page', 1, type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
     per_page = 3  # 페이지당 3개씩 표시
 
-    print(f"\n{'=' * 60}")
-    print(f"마이페이지 장바구니 조회")
-    print(f"{'=' * 60}")
-    print(f"사용자: {g.user.username} (ID: {g.user.id})")
-    print(f"이메일: {g.user.email}")
-    print(f"전화번호: {g.user.phone}")
-    print(f"페이지: {page}")
-
-    # DB에서 장바구니 아이템 조회
-    cart_items_db = CartItem.query.filter_by(user_id=g.user.id).order_by(CartItem.created_date.desc()).all()
-    print(f"DB 장바구니 아이템: {len(cart_items_db)}개")
-
-    if not cart_items_db:
-        print("장바구니가 비어있습니다")
-        print(f"{'=' * 60}\n")
-        return render_template('mypage.html', cart_items=None)
+    logger.debug('마이페이지 장바구니 조회: user_id=%s page=%s', g.user.id, page)
 
-    # DB에서 상품 정보 조회 (캐시 또는 Product 테이블)
-    items_with_info = []
-
-    for cart_item in cart_items_db:
-        # 방법 1: CartItem의 캐시된 정보 사용 (빠름)
-        if cart_item.name and cart_item.price:
-            item_data = {
-                'id': cart_item.product_id,
-                'brand': cart_item.brand,
-                'name': cart_item.name,
-                'price': cart_item.price,
-                'description': cart_item.description,
-                'image_url': cart_item.image_url,
-                'style': cart_item.style
-            }
-            items_with_info.append(item_data)
-            print(f"  ✅ 캐시 매칭: {item_data['name']}")
-        else:
-            # 방법 2: 캐시가 없으면 Product 테이블에서 조회
-            product = Product.query.get(cart_item.product_id)
-            if product:
-                item_data = {
-                    'id': product.id,
-                    'brand': product.brand,
-                    'name': product.name,
-                    'price': product.price,
-                    'description': product.description,
-                    'image_url': product.image_url,
-                    'style': product.style
-                }
-                items_with_info.append(item_data)
-                print(f"  ✅ DB 매칭: {item_data['name']}")
-            else:
-                print(f"  ❌ 매칭 실패: Product ID {cart_item.product_id} (상품 삭제됨)")
-
-    print(f"최종 매칭: {len(items_with_info)}개")
-
-    if not items_with_info:
-        print("표시할 장바구니 항목이 없습니다")
-        print(f"{'=' * 60}\n")
-        return render_template('mypage.html', cart_items=None)
+    # 스냅샷이 없는 항목은 Product 와 LEFT JOIN 해서 한 번에 가져온다 (상품이 삭제된 항목은 제외)
+    has_snapshot = and_(CartItem.name.isnot(None), CartItem.name != '',
+                        CartItem.price.isnot(None), CartItem.price != 0)
+    conditions = (CartItem.user_id == g.user.id, or_(has_snapshot, Product.id.isnot(None)))
 
-    # 3개의 이미지 이상 페이지네이션
-    total = len(items_with_info)
-    start = (page - 1) * per_page
-    end = start + per_page
-    current_items = items_with_info[start:end]
+    # 전체 개수는 COUNT 로, 목록은 현재 페이지만 LIMIT/OFFSET 으로 조회
+    total = db.session.scalar(
+        db.select(func.count(CartItem.id))
+        .outerjoin(Product, Product.id == CartItem.product_id)
+        .where(*conditions)
+    )
+    logger.debug('표시 가능한 장바구니 아이템: %d개', total)
+
+    if not total:
+        logger.debug('장바구니가 비어있습니다')
+        return render_template('mypage.html', cart_items=None)
 
-    print(f"현재 페이지: {page}/{math.ceil(total / per_page)}")
-    print(f"표시 아이템: {len(current_items)}개")
-    print(f"{'=' * 60}\n")
+    rows = db.session.execute(
+        db.select(CartItem, Product)
+        .outerjoin(Product, Product.id == CartItem.product_id)
+        .where(*conditions)
+        .order_by(CartItem.created_date.desc(), CartItem.id.desc())
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    ).all()
+
+    current_items = []
+    for cart_item, product in rows:
+        # 방법 1: CartItem의 캐시된 정보 사용, 방법 2: 캐시가 없으면 JOIN 된 Product 정보 사용
+        source = cart_item if cart_item.name and cart_item.price else product
+        current_items.append({
+            'id': cart_item.product_id,
+            'brand': source.brand,
+            'name': source.name,
+            'price': source.price,
+            'description': source.description,
+            'image_url': source.image_url,
+            'style': source.style
+        })
+
+    logger.debug('현재 페이지: %d/%d, 표시 아이템: %d개', page, math.ceil(total / per_page), len(current_items))
 
     cart_items = PaginatedItems(current_items, page, per_page, total)
 
-    return render_template('mypage.html', cart_items=cart_items)
\ No newline at end of file
+    return render_template('mypage.html', cart_items=cart_items)
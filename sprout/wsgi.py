@@ -0,0 +1,27 @@
+import gc
+import time
+
+from sprout import create_app, db
+from sprout.catalog import catalog
+
+
+# ========== 운영 서버 진입점 (gunicorn sprout.wsgi:app) ==========
+# gunicorn.conf.py 의 preload_app 으로 마스터에서 한 번만 import 된다.
+# 앱/템플릿/카탈로그를 여기서 미리 올려 두면 fork 된 워커들이 같은 메모리 페이지를 공유한다 (copy-on-write).
+started = time.perf_counter()
+
+app = create_app()
+
+with app.app_context():
+    # 카탈로그 스냅샷(인덱스 + 검색용 이름 포함)과 모든 템플릿을 미리 올린다 (바이트코드 캐시가 있으면 거기서 읽는다)
+    catalog.snapshot().warm()
+    for name in app.jinja_env.list_templates(filter_func=lambda name: name.endswith('.html')):
+        app.jinja_env.get_template(name)
+    # 마스터에서 연결이 만들어졌다면 워커가 같은 소켓을 공유하지 않도록 버린다
+    db.engine.dispose()
+
+# 지금까지 만든 객체는 GC 추적 대상에서 빼서, 워커에서 GC 가 돌 때 공유 페이지를 건드려 복사되지 않게 한다
+gc.collect()
+gc.freeze()
+
+load_seconds = time.perf_counter() - started
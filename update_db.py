@@ -1,6 +1,5 @@
-import json
 import os
-from datetime import datetime
+import time
 from sqlalchemy import text, inspect
 from sprout import create_app, db
 
@@ -27,6 +26,14 @@ with app.app_context():
     except Exception as e:
         print("address 컬럼은 이미 존재합니다")
 
+    try:
+        with db.engine.connect() as conn:
+            conn.execute(text('ALTER TABLE user ADD COLUMN cart_version INTEGER NOT NULL DEFAULT 0'))
+            conn.commit()
+        print("✅ cart_version 컬럼 추가 완료")
+    except Exception as e:
+        print("cart_version 컬럼은 이미 존재합니다")
+
     # --- cart_item 테이블 컬럼 추가 ---
     print("\n🛒 cart_item 테이블 업데이트 중...")
     cart_columns = ['username', 'brand', 'name', 'price', 'description', 'image_url', 'style']
@@ -86,66 +93,38 @@ with app.app_context():
     else:
         print("\n 'product' 테이블이 이미 존재합니다")
 
-    # JSON 파일에서 상품 데이터 읽기
-    print("\n JSON 파일 읽는 중...")
-    json_path = os.path.join('data', 'products.json')
+    # JSON 파일과 product 테이블 동기화 (스트리밍 + 스테이징 테이블 기반 diff)
+    print("\n JSON 파일 동기화 중...")
+    json_path = app.config['PRODUCTS_JSON_PATH']
 
     if os.path.exists(json_path):
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        products = data.get("products", data)
-        print(f"\n🛒 JSON에서 {len(products)}개의 상품 데이터를 읽었습니다.")
-
-        json_ids = [item.get("id") for item in products]
-        print(f"📊 JSON의 상품 ID: {json_ids}")
-
-        # 1단계: JSON에 있는 상품을 DB에 추가
-        print("\n" + "=" * 60)
-        print(" [1단계] JSON -> DB 추가")
-        print("=" * 60)
-
-        added = 0
-        for item in products:
-            product_id = item.get("id")
-            existing = db.session.get(Product, product_id)
-
-            if existing:
-                print(f" 이미 존재: {item.get('name')} (ID: {product_id})")
-                continue
-
-            product = Product(
-                id=product_id,
-                brand=item.get("brand"),
-                name=item.get("name"),
-                price=item.get("price"),
-                description=item.get("description"),
-                image_url=item.get("image_url"),
-                style=item.get("style")
-            )
-            db.session.add(product)
-            print(f"✅ 추가: {item.get('name')} (ID: {product_id})")
-            added += 1
-
-        db.session.commit()
-        print(f"\n 총 {added}개의 상품이 DB에 추가되었습니다.")
+        from sprout.sync import sync_products
 
-        # 2단계: DB에만 있고 JSON에 없는 상품 삭제
         print("\n" + "=" * 60)
-        print("[2단계] DB에서 삭제 (JSON에 없는 상품)")
+        print(" JSON -> DB 동기화 (추가 / 변경 / 삭제)")
         print("=" * 60)
 
-        all_products = Product.query.all()
-        deleted = 0
-
-        for product in all_products:
-            if product.id not in json_ids:
-                print(f"🗑️  삭제: {product.name} (ID: {product.id})")
-                db.session.delete(product)
-                deleted += 1
-
-        db.session.commit()
-        print(f"\n🗑️  총 {deleted}개의 상품이 DB에서 삭제되었습니다.")
+        started = time.perf_counter()
+        try:
+            result = sync_products(json_path)
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ 상품 동기화 중 오류: {e}")
+            raise
+
+        print(f"✅ 추가: {result['inserted']}개")
+        print(f"🔄 변경: {result['updated']}개")
+        print(f"🗑️  삭제: {result['deleted']}개")
+        print(f"🛒 장바구니 스냅샷 갱신: {result['cart_snapshots_refreshed']}개")
+        print(f"⏱️  소요 시간: {time.perf_counter() - started:.2f}초")
+
+        # 워커들이 mmap 으로 공유하는 컬럼형 카탈로그도 같은 JSON 으로 다시 만든다
+        from sprout.columnar import compile_catalog
+
+        started = time.perf_counter()
+        columnar_path = app.config['CATALOG_COLUMNAR_PATH']
+        count = compile_catalog(json_path, columnar_path)
+        print(f"📦 컬럼형 카탈로그: {columnar_path} ({count}개, {time.perf_counter() - started:.2f}초)")
 
         # 최종 상태 확인
         print("=" * 60)